@@ -0,0 +1,119 @@
+import numpy as np
+
+# BATCHED LOT SIZING: ONE ROW PER SKU, ONE COLUMN PER PERIOD
+# COSTS ARE SCALARS, ONE VALUE PER SKU (1-D) OR ONE VALUE PER SKU AND PERIOD (2-D, SKUS x PERIODS)
+
+def _per_sku(value, n_skus):
+	return np.broadcast_to(np.asarray(value, dtype=float), (n_skus,)).copy()
+
+def _per_sku_period(value, n_skus, n):
+	value = np.asarray(value, dtype=float)
+	if value.ndim < 2:
+		value = _per_sku(value, n_skus)[:, None]
+	return np.broadcast_to(value, (n_skus, n)).copy()
+
+# WAGNER-WITHIN FOR MANY SKUS AT ONCE
+def wagner_whitin_batch(demands, setup_costs, holding_costs, initial_inventory=0, block_size=4096, unit_costs=0):
+	demands = np.atleast_2d(np.asarray(demands, dtype=float))
+	n_skus, n = demands.shape
+	setup_costs = _per_sku_period(setup_costs, n_skus, n)
+	holding_costs = _per_sku_period(holding_costs, n_skus, n)
+	unit_costs = _per_sku_period(unit_costs, n_skus, n)
+	initial_inventory = _per_sku(initial_inventory, n_skus)
+
+	plans = np.zeros((n_skus, n))
+	costs = np.zeros(n_skus)
+
+	# SKUS ARE SOLVED IN BLOCKS SO THE TEMPORARY (SKUS x PERIODS) ARRAYS STAY SMALL
+	for start in range(0, n_skus, block_size):
+		rows = slice(start, min(start + block_size, n_skus))
+		block_plans, block_costs = _wagner_whitin_block(demands[rows], setup_costs[rows], holding_costs[rows],
+			unit_costs[rows])
+		plans[rows] = block_plans
+		costs[rows] = block_costs
+
+	# INVENTORY AT THE END OF EVERY PERIOD (ALL ZERO FOR SKUS WITHOUT DEMAND, LIKE wagner_whitin_algorithm)
+	inventory_levels = initial_inventory[:, None] + np.cumsum(plans - demands, axis=1)
+	inventory_levels[demands.sum(axis=1) == 0] = 0
+	return plans, inventory_levels, costs
+
+def _wagner_whitin_block(demands, setup_costs, holding_costs, unit_costs):
+	n_skus, n = demands.shape
+
+	# CUMULATIVE DEMAND, CUMULATIVE HOLDING COST H AND CUMULATIVE (DEMAND x H), ALL WITH A LEADING ZERO
+	cumsum = np.zeros((n_skus, n + 1))
+	cumsum[:, 1:] = np.cumsum(demands, axis=1)
+	H = np.zeros((n_skus, n + 1))
+	H[:, 1:] = np.cumsum(holding_costs, axis=1)
+	G = np.zeros((n_skus, n + 1))
+	G[:, 1:] = np.cumsum(demands * H[:, :n], axis=1)
+	# COST PER UNIT PRODUCED IN PERIOD p, BEFORE THE HOLDING UNTIL THE PERIOD OF ITS DEMAND
+	slope = unit_costs - H[:, :n]
+
+	F = np.zeros((n_skus, n + 1))
+	prev = np.zeros((n_skus, n + 1), dtype=np.int64)
+
+	for q in range(n):
+		# COST OF THE LAST SETUP IN EVERY PERIOD p <= q, FOR EVERY SKU AT ONCE
+		lot = cumsum[:, q + 1, None] - cumsum[:, :q + 1]
+		cost = F[:, :q + 1] + setup_costs[:, :q + 1] + slope[:, :q + 1] * lot + G[:, q + 1, None] - G[:, :q + 1]
+		best = np.argmin(cost, axis=1)	# FIRST MINIMUM -> TIES GO TO THE EARLIEST PERIOD
+		prev[:, q + 1] = best
+		F[:, q + 1] = cost[np.arange(n_skus), best]
+
+	# BACKTRACKING, ALL SKUS STEP BACK ONE LOT AT A TIME
+	plans = np.zeros((n_skus, n))
+	i = np.full(n_skus, n)
+	active = i > 0
+	while active.any():
+		sku = np.flatnonzero(active)
+		j = prev[sku, i[sku]]
+		plans[sku, j] = cumsum[sku, i[sku]] - cumsum[sku, j]
+		i[sku] = j
+		active = i > 0
+
+	# SKUS WITHOUT ANY DEMAND NEED NO SETUP (SAME AS THE SINGLE-SKU VERSION)
+	no_demand = cumsum[:, n] == 0
+	plans[no_demand] = 0
+	costs = np.where(no_demand, 0.0, F[:, n])
+	return plans, costs
+
+# JUST IN TIME FOR MANY SKUS AT ONCE, SAME RULES AS jit_heuristic
+def jit_batch(demands, setup_costs, holding_costs, initial_inventory=0, unit_costs=0):
+	demands = np.atleast_2d(np.asarray(demands, dtype=float))
+	n_skus, n = demands.shape
+	setup_costs = _per_sku_period(setup_costs, n_skus, n)
+	holding_costs = _per_sku_period(holding_costs, n_skus, n)
+	unit_costs = _per_sku_period(unit_costs, n_skus, n)
+
+	plans = np.zeros((n_skus, n))
+	inventory_levels = np.zeros((n_skus, n))
+	inventory = _per_sku(initial_inventory, n_skus)
+	costs = np.zeros(n_skus)
+
+	for t in range(n):
+		demand = demands[:, t]
+		has_demand = demand > 0
+		# ALWAYS PRODUCE JIT, ONLY IN PERIODS WITH DEMAND
+		production = np.where(has_demand, np.maximum(0, demand - inventory), 0)
+		inventory = np.where(has_demand, inventory + production - demand, inventory)
+		plans[:, t] = production
+		inventory_levels[:, t] = inventory
+		# CALCULATE COSTS
+		costs += np.where(production > 0, setup_costs[:, t] + production * unit_costs[:, t], 0)
+		costs += np.where(has_demand & (inventory > 0), inventory * holding_costs[:, t], 0)
+
+	return plans, inventory_levels, costs
+
+# BOTH METHODS FOR A WHOLE SKU SET
+def run_lot_sizing_batch(demands, setup_costs, holding_costs, initial_inventory=0, unit_costs=0):
+	ww_plans, ww_inventory, ww_costs = wagner_whitin_batch(demands, setup_costs, holding_costs, initial_inventory,
+		unit_costs=unit_costs)
+	jit_plans, jit_inventory, jit_costs = jit_batch(demands, setup_costs, holding_costs, initial_inventory, unit_costs)
+	return {
+		'ww_plans': ww_plans,
+		'ww_inventory': ww_inventory,
+		'ww_costs': ww_costs,
+		'jit_plans': jit_plans,
+		'jit_inventory': jit_inventory,
+		'jit_costs': jit_costs }
@@ -0,0 +1,71 @@
+import time
+import numpy as np
+import pandas as pd
+from Lot_sizing import just_in_time as jit
+from Lot_sizing import heuristics as hr
+from Lot_sizing import capacitated as cap
+from Lot_sizing import lot_sizing as ls
+
+# SYNTHETIC DEMAND SERIES: STEADY, SEASONAL AND LUMPY (MANY ZERO PERIODS)
+def synthetic_demand(pattern, n, rng):
+	if pattern == 'steady':
+		return rng.integers(80, 121, n).astype(float).tolist()
+	if pattern == 'seasonal':
+		season = 100 + 60 * np.sin(np.arange(n) * 2 * np.pi / 12)
+		return np.maximum(0, np.round(season + rng.normal(0, 15, n))).tolist()
+	if pattern == 'lumpy':
+		return np.where(rng.random(n) < 0.4, rng.integers(50, 400, n), 0).astype(float).tolist()
+	raise ValueError(f"Unknown demand pattern: {pattern}")
+
+# RUNTIME AND COST GAP TO WAGNER-WITHIN OF EVERY HEURISTIC ON A LIST OF (DEMAND, SETUP, HOLDING) INSTANCES
+def benchmark_instances(instances, label):
+	methods = {'JIT': jit.jit_heuristic, **hr.HEURISTICS}
+	optimal = []
+	start = time.perf_counter()
+	for demand, setup_cost, holding_cost in instances:
+		# UNCAPACITATED OPTIMUM: WAGNER-WITHIN WITHOUT THE LEADING ZERO-DEMAND PERIODS (NO SETUP IS PAID FOR THEM)
+		optimal.append(cap.lower_bound(demand, setup_cost, holding_cost))
+	rows = [{
+		'data': label,
+		'method': 'Wagner-Whitin',
+		'seconds': time.perf_counter() - start,
+		'mean_gap_%': 0.0,
+		'max_gap_%': 0.0 }]
+
+	for name, method in methods.items():
+		gaps = []
+		start = time.perf_counter()
+		costs = [method(demand, setup_cost, holding_cost)[2] for demand, setup_cost, holding_cost in instances]
+		seconds = time.perf_counter() - start
+		for cost, best in zip(costs, optimal):
+			gaps.append((cost - best) / best * 100 if best > 0 else 0.0)
+		rows.append({
+			'data': label,
+			'method': name,
+			'seconds': seconds,
+			'mean_gap_%': float(np.mean(gaps)),
+			'max_gap_%': float(np.max(gaps)) })
+	return rows
+
+def run_benchmark(n_series=200, n_periods=52, csv_files=('lot_sizing_data_1.csv', 'lot_sizing_data_2.csv'), seed=0):
+	rng = np.random.default_rng(seed)
+	rows = []
+
+	# SYNTHETIC SERIES WITH A RANDOM SETUP / HOLDING RATIO EACH
+	for pattern in ('steady', 'seasonal', 'lumpy'):
+		instances = [(synthetic_demand(pattern, n_periods, rng), float(rng.uniform(100, 2000)), float(rng.uniform(0.2, 5)))
+			for _ in range(n_series)]
+		rows += benchmark_instances(instances, f"{pattern} x{n_series}")
+
+	# THE PROJECT'S CSV FILES, WITH THEIR PER-PERIOD COSTS
+	for csv_file in csv_files:
+		data = ls.load_lot_sizing_data(csv_file)
+		rows += benchmark_instances([(data['demand'], data['setup_costs'], data['holding_costs'])], csv_file)
+
+	results = pd.DataFrame(rows)
+	print(results.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+	return results
+
+# FOR RUNNING THE BENCHMARK FROM THE PROJECT ROOT: python -m Lot_sizing.benchmark
+if __name__ == "__main__":
+	run_benchmark()
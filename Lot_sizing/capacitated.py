@@ -0,0 +1,193 @@
+import math
+import time
+import pulp
+from Lot_sizing import wagner_within as ww
+
+# LARGEST HORIZON SOLVED EXACTLY WITH THE MILP WHEN method='auto'
+EXACT_LIMIT = 26
+
+# DEMAND LEFT AFTER USING UP THE INITIAL INVENTORY
+def net_demand(demand, initial_inventory=0):
+	remaining = initial_inventory
+	net = []
+	for d in demand:
+		used = min(d, remaining)
+		remaining -= used
+		net.append(d - used)
+	return net
+
+# INVENTORY LEVELS AND COST OF A PLAN (HOLDING ON END-OF-PERIOD INVENTORY, LIKE WAGNER-WHITIN)
+# COSTS CAN BE ONE VALUE OR ONE VALUE PER PERIOD
+def evaluate_plan(plan, demand, setup_cost, holding_cost, initial_inventory=0, unit_cost=0):
+	n = len(demand)
+	setup_cost = ww.per_period(setup_cost, n)
+	holding_cost = ww.per_period(holding_cost, n)
+	unit_cost = ww.per_period(unit_cost, n)
+	inventory = initial_inventory
+	inventory_levels = []
+	cost = 0
+	for t in range(n):
+		inventory += plan[t] - demand[t]
+		inventory_levels.append(inventory)
+		if plan[t] > 0:
+			cost += setup_cost[t] + plan[t] * unit_cost[t]
+		cost += max(inventory, 0) * holding_cost[t]
+	return inventory_levels, cost
+
+# LOWER BOUND: UNCAPACITATED WAGNER-WHITIN ON THE NET DEMAND (MIN/MAX PRODUCTION RELAXED),
+# OR THE SETUPS NEEDED JUST TO PRODUCE THE NET DEMAND WITH Max_Production, WHICHEVER IS HIGHER
+def lower_bound(demand, setup_cost, holding_cost, max_production=None, initial_inventory=0, unit_cost=0):
+	n = len(demand)
+	setup_cost = ww.per_period(setup_cost, n)
+	holding_cost = ww.per_period(holding_cost, n)
+	unit_cost = ww.per_period(unit_cost, n)
+	net = net_demand(demand, initial_inventory)
+	# LEADING PERIODS WITHOUT NET DEMAND ARE DROPPED, WAGNER-WHITIN WOULD PAY A SETUP FOR THEM
+	first = next((t for t, d in enumerate(net) if d > 0), n)
+	bound = ww.wagner_whitin_fast(net[first:], setup_cost[first:], holding_cost[first:], unit_cost=unit_cost[first:])[2]
+	if max_production and first < n:
+		forced = min(setup_cost[first:]) * math.ceil(sum(net) / max_production)
+		bound = max(bound, forced + min(unit_cost[first:]) * sum(net))
+	return bound
+
+# DIXON-SILVER STYLE HEURISTIC
+def dixon_silver(demand, setup_cost, holding_cost, min_production, max_production, initial_inventory=0, unit_cost=0):
+	n = len(demand)
+	setup_cost = ww.per_period(setup_cost, n)
+	unit_cost = ww.per_period(unit_cost, n)
+	# HOLDING ONE UNIT FROM THE END OF PERIOD s TO THE START OF PERIOD t COSTS H[t] - H[s]
+	H = ww.compute_cumsum(ww.per_period(holding_cost, n))
+	requirement = net_demand(demand, initial_inventory)
+
+	# STEP 1: MOVE DEMAND ABOVE CAPACITY TO EARLIER PERIODS (BACKWARDS), SO LOT-FOR-LOT BECOMES FEASIBLE
+	for t in range(n - 1, 0, -1):
+		if requirement[t] > max_production:
+			requirement[t - 1] += requirement[t] - max_production
+			requirement[t] = max_production
+	if n > 0 and requirement[0] > max_production:
+		raise ValueError("Demand cannot be met with the given Max_Production")
+
+	# STEP 2: EXTEND EVERY LOT WITH WHOLE FUTURE REQUIREMENTS WHILE THE COST PER PERIOD FALLS AND CAPACITY ALLOWS
+	plan = [0] * n
+	t = 0
+	while t < n:
+		if requirement[t] == 0:
+			t += 1
+			continue
+		lot = requirement[t]
+		holding = 0
+		average = setup_cost[t]
+		k = t + 1
+		while k < n:
+			# PRODUCING REQUIREMENT k IN PERIOD t: HOLDING PLUS THE UNIT COST DIFFERENCE TO PERIOD k
+			new_holding = holding + requirement[k] * (H[k] - H[t] + unit_cost[t] - unit_cost[k])
+			new_average = (setup_cost[t] + new_holding) / (k - t + 1)
+			if new_average > average or lot + requirement[k] > max_production:
+				break
+			lot += requirement[k]
+			requirement[k] = 0
+			holding, average = new_holding, new_average
+			k += 1
+		plan[t] = lot
+		t = k
+
+	# STEP 3: LOTS BELOW THE MINIMUM ARE RAISED, THE SURPLUS REPLACES PRODUCTION OF LATER LOTS
+	surplus = 0
+	for t in range(n):
+		if plan[t] == 0:
+			continue
+		quantity = max(plan[t] - surplus, 0)
+		if 0 < quantity < min_production:
+			quantity = min_production
+		surplus += quantity - plan[t]
+		plan[t] = quantity
+
+	# STEP 4: DROP A SETUP WHEN ITS LOT FITS INTO THE SPARE CAPACITY OF EARLIER LOTS AND THAT IS CHEAPER
+	improved = True
+	while improved:
+		improved = False
+		for t in range(n - 1, 0, -1):
+			if plan[t] == 0:
+				continue
+			moves = []
+			left = plan[t]
+			extra_holding = 0
+			for s in range(t - 1, -1, -1):	# LATEST EARLIER LOTS FIRST, THEY ADD THE LEAST HOLDING
+				if plan[s] > 0 and plan[s] < max_production:
+					quantity = min(left, max_production - plan[s])
+					moves.append((s, quantity))
+					extra_holding += quantity * (H[t] - H[s] + unit_cost[s] - unit_cost[t])
+					left -= quantity
+					if left == 0:
+						break
+			if left == 0 and extra_holding < setup_cost[t]:
+				for s, quantity in moves:
+					plan[s] += quantity
+				plan[t] = 0
+				improved = True
+
+	return plan
+
+# EXACT MILP WITH PULP (CBC)
+def capacitated_milp(demand, setup_cost, holding_cost, min_production, max_production, initial_inventory=0, time_limit=10,
+		unit_cost=0):
+	n = len(demand)
+	setup_cost = ww.per_period(setup_cost, n)
+	holding_cost = ww.per_period(holding_cost, n)
+	unit_cost = ww.per_period(unit_cost, n)
+	model = pulp.LpProblem("Capacitated_Lot_Sizing", pulp.LpMinimize)
+	produce = [pulp.LpVariable(f"Produce_{t}", lowBound=0) for t in range(n)]
+	setup = [pulp.LpVariable(f"Setup_{t}", cat="Binary") for t in range(n)]
+	stock = [pulp.LpVariable(f"Inventory_{t}", lowBound=0) for t in range(n)]
+
+	# NOTHING ABOVE THE REMAINING DEMAND IS EVER NEEDED: TIGHTER THAN max_production ALONE
+	remaining = [sum(demand[t:]) for t in range(n)]
+
+	model += pulp.lpSum(setup_cost[t] * setup[t] + unit_cost[t] * produce[t] + holding_cost[t] * stock[t]
+		for t in range(n)), "Total_Cost"
+	for t in range(n):
+		previous = stock[t - 1] if t > 0 else initial_inventory
+		model += previous + produce[t] - demand[t] == stock[t], f"Balance_{t}"
+		model += produce[t] <= max(min(max_production, remaining[t]), min_production) * setup[t], f"Max_Production_{t}"
+		model += produce[t] >= min_production * setup[t], f"Min_Production_{t}"
+
+	model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+	if model.sol_status == pulp.LpSolutionOptimal:
+		status = 'Optimal'
+	elif model.sol_status == pulp.LpSolutionIntegerFeasible:
+		status = 'Feasible'	# TIME LIMIT REACHED WITH A SOLUTION, NOT PROVEN OPTIMAL
+	else:
+		raise ValueError(f"Capacitated lot sizing could not be solved: {pulp.LpStatus[model.status]}")
+	return [round(v.varValue, 6) for v in produce], status
+
+# CAPACITATED LOT SIZING: EXACT FOR SHORT HORIZONS, HEURISTIC FOR LONG ONES
+def capacitated_lot_sizing(demand, setup_cost, holding_cost, min_production, max_production,
+		initial_inventory=0, method='auto', exact_limit=EXACT_LIMIT, time_limit=10, unit_cost=0):
+	if min_production > max_production:
+		raise ValueError(f"Min_Production ({min_production}) is larger than Max_Production ({max_production})")
+	if method == 'auto':
+		method = 'milp' if len(demand) <= exact_limit else 'heuristic'
+
+	start = time.perf_counter()
+	if method == 'milp':
+		plan, status = capacitated_milp(demand, setup_cost, holding_cost, min_production, max_production,
+			initial_inventory, time_limit, unit_cost)
+	elif method == 'heuristic':
+		plan, status = dixon_silver(demand, setup_cost, holding_cost, min_production, max_production,
+			initial_inventory, unit_cost), 'Heuristic'
+	else:
+		raise ValueError(f"Unknown method: {method} (use 'auto', 'milp' or 'heuristic')")
+	solve_seconds = time.perf_counter() - start
+
+	inventory_levels, cost = evaluate_plan(plan, demand, setup_cost, holding_cost, initial_inventory, unit_cost)
+	bound = cost if status == 'Optimal' else lower_bound(demand, setup_cost, holding_cost, max_production,
+		initial_inventory, unit_cost)
+	return {
+		'method': method,
+		'status': status,
+		'plan': plan,
+		'inventory': inventory_levels,
+		'cost': cost,
+		'lower_bound': bound,
+		'gap': (cost - bound) / cost if cost > 0 else 0.0,
+		'solve_seconds': solve_seconds }
@@ -0,0 +1,81 @@
+import math
+from Lot_sizing import wagner_within as ww
+from Lot_sizing import capacitated as cap
+
+# LINEAR-TIME LOT SIZING HEURISTICS, SAME SIGNATURE AND RETURN VALUE AS jit_heuristic:
+# (PRODUCTION PLAN, INVENTORY LEVELS, TOTAL COST), COSTS CAN BE ONE VALUE OR ONE VALUE PER PERIOD
+# EVERY HEURISTIC STARTS A LOT IN THE FIRST PERIOD WITH OPEN DEMAND AND ADDS WHOLE FUTURE PERIODS
+# WHILE ITS RULE SAYS SO, EVERY PERIOD IS LOOKED AT ONCE
+
+# SHARED LOT-BUILDING LOOP, keep(setup, lot, holding, periods, new_lot, new_holding) DECIDES IF THE NEXT PERIOD IS ADDED
+def build_lots(demand, setup_cost, holding_cost, initial_inventory, unit_cost, keep):
+	n = len(demand)
+	setup_cost = ww.per_period(setup_cost, n)
+	unit_cost = ww.per_period(unit_cost, n)
+	# HOLDING ONE UNIT FROM THE END OF PERIOD t TO THE START OF PERIOD k COSTS H[k] - H[t]
+	H = ww.compute_cumsum(ww.per_period(holding_cost, n))
+	requirement = cap.net_demand(demand, initial_inventory)
+
+	plan = [0] * n
+	t = 0
+	while t < n:
+		if requirement[t] == 0:
+			t += 1
+			continue
+		lot = requirement[t]
+		holding = 0
+		k = t + 1
+		while k < n:
+			# HOLDING PLUS THE UNIT COST DIFFERENCE OF PRODUCING PERIOD k's DEMAND IN PERIOD t
+			new_holding = holding + requirement[k] * (H[k] - H[t] + unit_cost[t] - unit_cost[k])
+			if not keep(setup_cost[t], lot, holding, k - t, lot + requirement[k], new_holding):
+				break
+			lot += requirement[k]
+			holding = new_holding
+			k += 1
+		plan[t] = lot
+		t = k
+
+	inventory_levels, cost = cap.evaluate_plan(plan, demand, setup_cost, holding_cost, initial_inventory, unit_cost)
+	return plan, inventory_levels, cost
+
+# SILVER-MEAL: EXTEND WHILE THE COST PER PERIOD COVERED DOES NOT GO UP
+def silver_meal(demand, setup_cost, holding_cost, initial_inventory=0, unit_cost=0):
+	def keep(setup, lot, holding, periods, new_lot, new_holding):
+		return (setup + new_holding) / (periods + 1) <= (setup + holding) / periods
+	return build_lots(demand, setup_cost, holding_cost, initial_inventory, unit_cost, keep)
+
+# LEAST UNIT COST: EXTEND WHILE THE COST PER UNIT PRODUCED DOES NOT GO UP
+def least_unit_cost(demand, setup_cost, holding_cost, initial_inventory=0, unit_cost=0):
+	def keep(setup, lot, holding, periods, new_lot, new_holding):
+		return (setup + new_holding) / new_lot <= (setup + holding) / lot
+	return build_lots(demand, setup_cost, holding_cost, initial_inventory, unit_cost, keep)
+
+# PART-PERIOD BALANCING: EXTEND WHILE THE HOLDING COST OF THE LOT GETS CLOSER TO ITS SETUP COST
+def part_period_balancing(demand, setup_cost, holding_cost, initial_inventory=0, unit_cost=0):
+	def keep(setup, lot, holding, periods, new_lot, new_holding):
+		return abs(new_holding - setup) <= abs(holding - setup)
+	return build_lots(demand, setup_cost, holding_cost, initial_inventory, unit_cost, keep)
+
+# EOQ POLICY: WHOLE PERIODS ARE ADDED WHILE THE LOT GETS CLOSER TO THE ECONOMIC ORDER QUANTITY
+# (EOQ FROM THE AVERAGE DEMAND PER PERIOD AND THE AVERAGE SETUP AND HOLDING COSTS)
+def eoq_policy(demand, setup_cost, holding_cost, initial_inventory=0, unit_cost=0):
+	n = len(demand)
+	average_setup = sum(ww.per_period(setup_cost, n)) / n if n else 0
+	average_holding = sum(ww.per_period(holding_cost, n)) / n if n else 0
+	average_demand = sum(demand) / n if n else 0
+	if average_holding > 0:
+		eoq = math.sqrt(2 * average_demand * average_setup / average_holding)
+	else:
+		eoq = float('inf')	# FREE STORAGE: ONE LOT FOR EVERYTHING
+
+	def keep(setup, lot, holding, periods, new_lot, new_holding):
+		return abs(new_lot - eoq) <= abs(lot - eoq)
+	return build_lots(demand, setup_cost, holding_cost, initial_inventory, unit_cost, keep)
+
+# ALL HEURISTICS BY NAME, FOR THE BENCHMARK AND FOR PICKING ONE
+HEURISTICS = {
+	'Silver-Meal': silver_meal,
+	'Least Unit Cost': least_unit_cost,
+	'Part-Period Balancing': part_period_balancing,
+	'EOQ': eoq_policy }
@@ -1,12 +1,19 @@
+from Lot_sizing.wagner_within import per_period
+
 # CALCULATING JUST IN TIME PRODUCTION METHOD
-def jit_heuristic(demand, setup_cost, holding_cost, initial_inventory=0):
+# SETUP, HOLDING AND UNIT COSTS CAN BE ONE VALUE OR ONE VALUE PER PERIOD
+def jit_heuristic(demand, setup_cost, holding_cost, initial_inventory=0, unit_cost=0):
 	n = len(demand)
 	production_plan = [0] * n
 	inventory_levels = [0] * n
+	setup_cost = per_period(setup_cost, n)
+	holding_cost = per_period(holding_cost, n)
+	unit_cost = per_period(unit_cost, n)
 	
 	inventory = initial_inventory
 	total_setup_cost = 0
 	total_holding_cost = 0
+	total_production_cost = 0
 	
 	for i in range(n):
 		if demand[i] > 0:
@@ -18,11 +25,12 @@ def jit_heuristic(demand, setup_cost, holding_cost, initial_inventory=0):
 			inventory_levels[i] = inventory
 			# CALCULATE COSTS
 			if production_qty > 0:
-				total_setup_cost += setup_cost
+				total_setup_cost += setup_cost[i]
+				total_production_cost += production_qty * unit_cost[i]
 			if inventory > 0:
-				total_holding_cost += inventory * holding_cost
+				total_holding_cost += inventory * holding_cost[i]
 		else:
 			inventory_levels[i] = inventory
 	
-	total_cost = total_setup_cost + total_holding_cost
+	total_cost = total_setup_cost + total_holding_cost + total_production_cost
 	return production_plan, inventory_levels, total_cost
@@ -5,6 +5,8 @@ import sys
 from Lot_sizing import wagner_within as ww
 from Lot_sizing import just_in_time as jit
 from Lot_sizing import visualisation as vs
+from Lot_sizing import capacitated as cap
+from Lot_sizing import batch_lot_sizing as bl
 from pathlib import Path
 
 # COLOR CODES
@@ -17,40 +19,174 @@ GREY = '\033[90m'
 # GETTING BASE DIRECTORY AS A GLOBAL VARIABLE
 BASE_DIR = Path(__file__).resolve().parent
 
+# NUMERIC COLUMNS OF THE LOT SIZING CSVS
+NUMERIC_COLUMNS = ['Period', 'Demand', 'Setup_Cost', 'Holding_Cost', 'Min_Production', 'Max_Production', 'Unit_Cost']
+# LARGEST NUMBER OF BAD ROWS LISTED PER COLUMN IN AN ERROR MESSAGE
+MAX_REPORTED_ROWS = 20
+
+# CONVERT THE NUMERIC COLUMNS TO FLOAT IN ONE GO AND COLLECT EVERY BAD CELL (first_row: FILE ROW OF df'S FIRST ROW)
+def numeric_errors(df, first_row=2):
+	errors = []
+	for col in NUMERIC_COLUMNS:
+		if col not in df.columns:
+			continue
+		if pd.api.types.is_numeric_dtype(df[col]):
+			values = df[col].astype(float)	# CLEAN COLUMN, ALREADY PARSED BY read_csv
+		else:
+			# STRIP SPACES, ANYTHING THAT IS NOT A NUMBER BECOMES NaN
+			values = pd.to_numeric(df[col].astype(str).str.strip(), errors='coerce')
+		bad = np.flatnonzero(values.isna().to_numpy())
+		if len(bad) > 0:
+			rows = ', '.join(str(row + first_row) for row in bad[:MAX_REPORTED_ROWS])
+			more = f" and {len(bad) - MAX_REPORTED_ROWS} more" if len(bad) > MAX_REPORTED_ROWS else ""
+			errors.append(f"column '{col}', rows {rows}{more}")
+		df[col] = values
+	return errors
+
 def load_lot_sizing_data(csv_file='lot_sizing_data_2.csv'):
 	csv_path = BASE_DIR / csv_file
 
 	# READCSV
 	if not csv_path.exists():
 		raise FileNotFoundError(f"CSV file not found: {csv_path}")
-	df = pd.read_csv(csv_path)
 
-	# CHECK REQUIRED COLUMNS
+	# CHECK REQUIRED COLUMNS (HEADER ONLY), THEN READ JUST THE COLUMNS THAT ARE USED
 	required_columns = ['Period', 'Demand', 'Setup_Cost', 'Holding_Cost', 'Min_Production', 'Max_Production']
-	missing = [col for col in required_columns if col not in df.columns]
+	header = pd.read_csv(csv_path, nrows=0).columns
+	missing = [col for col in required_columns if col not in header]
 	if missing:
 		raise ValueError(f"CSV missing required columns: {missing}")
+	df = pd.read_csv(csv_path, usecols=[col for col in NUMERIC_COLUMNS if col in header])
 
-	# STRIP STRINGS AND CHECK ONLY ALLOWED CHARACTERS (NUMBERS; DECIMAL POINTS; COMMA SEPERATORS)
-	for col in df.columns:
-		for i, val in enumerate(df[col]):
-			val_str = str(val).strip()  # REMOVE SPACES
-			if col in ['Period', 'Demand', 'Setup_Cost', 'Holding_Cost', 'Min_Production', 'Max_Production']:
-				try:
-					float(val_str)
-				except ValueError:
-					raise ValueError(f"Invalid value in column '{col}', row {i+2}: '{val}' (must be a number)")
+	# EVERY CELL MUST BE A NUMBER, ALL BAD CELLS ARE REPORTED TOGETHER
+	errors = numeric_errors(df)
+	if errors:
+		raise ValueError(f"Invalid values (must be numbers) in {'; '.join(errors)}")
 
-	return {
-		'periods': df['Period'].astype(float).tolist(),
-		'demand': df['Demand'].astype(float).tolist(),
+	data = {
+		'periods': df['Period'].tolist(),
+		'demand': df['Demand'].tolist(),
 		'setup_cost': float(df['Setup_Cost'].iloc[0]),
 		'holding_cost': float(df['Holding_Cost'].iloc[0]),
+		'setup_costs': df['Setup_Cost'].tolist(),
+		'holding_costs': df['Holding_Cost'].tolist(),
 		'min_production': float(df['Min_Production'].iloc[0]),
 		'max_production': float(df['Max_Production'].iloc[0]),
 		'unit_cost': 50,
 		'initial_inventory': 0 }
 
+	# OPTIONAL PER-PERIOD PRODUCTION COST (ONLY CHANGES THE PLAN WHEN IT VARIES BETWEEN PERIODS)
+	if 'Unit_Cost' in df.columns:
+		data['unit_costs'] = df['Unit_Cost'].tolist()
+	return data
+
+# MULTI-SKU FILES: ONE ROW PER SKU AND PERIOD, ROWS OF ONE SKU NEXT TO EACH OTHER IN PERIOD ORDER
+# COLUMNS: SKU, Demand, Setup_Cost, Holding_Cost AND OPTIONALLY Period, Unit_Cost
+# THE FILE IS READ chunk_rows ROWS AT A TIME, THE LAST SKU OF A CHUNK IS CARRIED OVER TO THE NEXT ONE
+# YIELDS (SKU NAMES, PERIODS PER SKU, DEMANDS, SETUP COSTS, HOLDING COSTS, UNIT COSTS) WITH SKUS x PERIODS ARRAYS
+def stream_sku_batches(csv_file, chunk_rows=500_000, batch_skus=4096):
+	csv_path = BASE_DIR / csv_file
+	if not csv_path.exists():
+		raise FileNotFoundError(f"CSV file not found: {csv_path}")
+	header = pd.read_csv(csv_path, nrows=0).columns
+	missing = [col for col in ['SKU', 'Demand', 'Setup_Cost', 'Holding_Cost'] if col not in header]
+	if missing:
+		raise ValueError(f"CSV missing required columns: {missing}")
+	columns = [col for col in ['SKU', 'Period', 'Demand', 'Setup_Cost', 'Holding_Cost', 'Unit_Cost'] if col in header]
+
+	errors = []
+	seen = set()
+	carry = None
+	first_row = 2
+	for chunk in pd.read_csv(csv_path, usecols=columns, dtype={'SKU': str}, chunksize=chunk_rows):
+		# BAD CELLS OF THE WHOLE FILE ARE COLLECTED, NOTHING MORE IS SOLVED AFTER THE FIRST ONE
+		errors += numeric_errors(chunk, first_row)
+		no_sku = np.flatnonzero(chunk['SKU'].isna().to_numpy())
+		if len(no_sku) > 0:
+			errors.append(f"column 'SKU', rows {', '.join(str(row + first_row) for row in no_sku[:MAX_REPORTED_ROWS])} (empty)")
+		first_row += len(chunk)
+		if errors:
+			continue
+		if carry is not None:
+			chunk = pd.concat([carry, chunk], ignore_index=True)
+
+		# ROWS OF THE LAST SKU MAY CONTINUE IN THE NEXT CHUNK
+		sku = chunk['SKU'].to_numpy()
+		others = np.flatnonzero(sku != sku[-1])
+		last_run = others[-1] + 1 if len(others) > 0 else 0
+		carry = chunk.iloc[last_run:]
+		yield from sku_batches(chunk.iloc[:last_run], batch_skus, seen)
+
+	if errors:
+		raise ValueError(f"Invalid values (must be numbers) in {'; '.join(errors)}")
+	if carry is not None:
+		yield from sku_batches(carry, batch_skus, seen)
+
+# COMPLETE SKUS OF ONE CHUNK AS PADDED SKUS x PERIODS ARRAYS (DEMAND PADDED WITH 0, COSTS WITH THE SKU'S LAST VALUE)
+def sku_batches(df, batch_skus, seen):
+	if len(df) == 0:
+		return
+	sku = df['SKU'].to_numpy()
+	starts = np.flatnonzero(np.r_[True, sku[1:] != sku[:-1]])
+	names = sku[starts]
+	if len(set(names)) < len(names) or not seen.isdisjoint(names):
+		raise ValueError("Rows of every SKU must be next to each other in the CSV file")
+	seen.update(names)
+	lengths = np.diff(np.r_[starts, len(sku)])
+
+	# COLUMN OF EVERY ROW IN ITS SKU'S ROW, ROWS ARE PUT IN PERIOD ORDER WHEN THERE IS A Period COLUMN
+	order = np.arange(len(df))
+	if 'Period' in df.columns:
+		order = np.lexsort((df['Period'].to_numpy(), np.repeat(np.arange(len(starts)), lengths)))
+	values = {col: df[col].to_numpy()[order] for col in ['Demand', 'Setup_Cost', 'Holding_Cost', 'Unit_Cost'] if col in df.columns}
+
+	for first in range(0, len(starts), batch_skus):
+		block_starts = starts[first:first + batch_skus]
+		block_lengths = lengths[first:first + batch_skus]
+		rows = slice(block_starts[0], block_starts[-1] + block_lengths[-1])
+		row = np.repeat(np.arange(len(block_starts)), block_lengths)
+		col = np.arange(rows.stop - rows.start) - np.repeat(block_starts - block_starts[0], block_lengths)
+		n_periods = block_lengths.max()
+
+		def to_array(name, pad_with_last):
+			column = values[name][rows]
+			if pad_with_last:
+				array = np.repeat(column[np.cumsum(block_lengths) - 1, None], n_periods, axis=1)
+			else:
+				array = np.zeros((len(block_starts), n_periods))
+			array[row, col] = column
+			return array
+
+		unit_costs = to_array('Unit_Cost', True) if 'Unit_Cost' in values else 0
+		yield (names[first:first + batch_skus], block_lengths, to_array('Demand', False),
+			to_array('Setup_Cost', True), to_array('Holding_Cost', True), unit_costs)
+
+# WAGNER-WITHIN AND JIT FOR EVERY SKU OF A MULTI-SKU FILE, BATCH BY BATCH
+# RETURNS ONE SUMMARY ROW PER SKU, OR APPENDS THEM TO output_csv WHILE THE FILE IS READ
+def run_lot_sizing_file(csv_file, output_csv=None, chunk_rows=500_000, batch_skus=4096):
+	summaries = []
+	first = True
+	for names, lengths, demands, setup_costs, holding_costs, unit_costs in stream_sku_batches(csv_file, chunk_rows, batch_skus):
+		result = bl.run_lot_sizing_batch(demands, setup_costs, holding_costs, unit_costs=unit_costs)
+		summary = pd.DataFrame({
+			'SKU': names,
+			'Periods': lengths,
+			'WW_Cost': result['ww_costs'],
+			'WW_Setups': (result['ww_plans'] > 0).sum(axis=1),
+			'JIT_Cost': result['jit_costs'],
+			'JIT_Setups': (result['jit_plans'] > 0).sum(axis=1) })
+		if output_csv is None:
+			summaries.append(summary)
+		else:
+			summary.to_csv(output_csv, mode='w' if first else 'a', header=first, index=False)
+		first = False
+
+	if output_csv is not None:
+		return None
+	if not summaries:
+		return pd.DataFrame(columns=['SKU', 'Periods', 'WW_Cost', 'WW_Setups', 'JIT_Cost', 'JIT_Setups'])
+	return pd.concat(summaries, ignore_index=True)
+
 def generate_sample_data():
 	periods = list(range(1, 13))
 	demand = [120, 95, 110, 130, 115, 125, 140, 100, 135, 120, 150, 125]
@@ -116,30 +252,59 @@ def display_results(periods, demand, ww_plan, ww_inventory, ww_cost, jit_plan, j
 	print(f"{'Total':<8} {sum(demand):<8} {sum(ww_plan):<12} {'':<14} "
 		  f"{sum(jit_plan):<12} {'':<12}")
 
-def make_summary(periods, demand, ww_plan, ww_inventory, jit_plan, jit_inventory, setup_cost, holding_cost):
+def display_capacitated_results(result, min_production, max_production):
+	# PRINTING OUT CAPACITATED LOT SIZING (USES MIN/MAX PRODUCTION)
+	print("\n" + "-"*80)
+	print(f"CAPACITATED ({result['method'].upper()}, production between {min_production} and {max_production})")
+	print("-"*80)
+	print(f"Status: {result['status']}")
+	print(f"Total Cost: €{result['cost']:.2f}")
+	print(f"Gap to lower bound: {result['gap']*100:.1f}% (lower bound €{result['lower_bound']:.2f})")
+	print(f"Solve time: {result['solve_seconds']:.3f} s")
+	print(f"Production setups: {sum(1 for p in result['plan'] if p > 0)}")
+	print(f"Production plan: {[round(p, 1) for p in result['plan']]}")
+
+# ONE COST FOR THE SUMMARY, OR ITS RANGE WHEN IT CHANGES BETWEEN PERIODS
+def describe_cost(cost, n):
+	costs = ww.per_period(cost, n)
+	if min(costs) == max(costs):
+		return f"€{costs[0]}"
+	return f"€{min(costs)} - €{max(costs)} (varies per period)"
+
+# SETUP, PRODUCTION AND HOLDING COST OF A PLAN WITH ITS INVENTORY LEVELS
+def plan_cost(plan, inventory, setup_cost, holding_cost, unit_cost=0):
+	n = len(plan)
+	setup_cost = ww.per_period(setup_cost, n)
+	holding_cost = ww.per_period(holding_cost, n)
+	unit_cost = ww.per_period(unit_cost, n)
+	return (sum(setup_cost[t] + plan[t] * unit_cost[t] for t in range(n) if plan[t] > 0)
+		+ sum(inventory[t] * holding_cost[t] for t in range(n)))
+
+def make_summary(periods, demand, ww_plan, ww_inventory, jit_plan, jit_inventory, setup_cost, holding_cost, unit_cost=0):
+	n = len(periods)
 	#RETURNING SUMMARY IN ONE STRING
- 	return f"""
+	return f"""
 Lot Sizing Analysis Summary
 Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
-Setup Cost: €{setup_cost}
-Holding Cost: €{holding_cost}
+Setup Cost: {describe_cost(setup_cost, n)}
+Holding Cost: {describe_cost(holding_cost, n)}
 Total Periods: {len(periods)}
 Total Demand: {sum(demand)} units
 
 Wagner-Whitin Results:
-- Total Cost: €{sum([setup_cost if p > 0 else 0 for p in ww_plan]) + sum([h * holding_cost for h in ww_inventory]):.2f}
+- Total Cost: €{plan_cost(ww_plan, ww_inventory, setup_cost, holding_cost, unit_cost):.2f}
 - Production Setups: {sum(1 for p in ww_plan if p > 0)}
 - Total Production: {sum(ww_plan)} units
 - Average Inventory: {sum(ww_inventory)/len(ww_inventory):.1f} units
 
 JIT Results:
-- Total Cost: €{sum([setup_cost if p > 0 else 0 for p in jit_plan]) + sum([h * holding_cost for h in jit_inventory]):.2f}
+- Total Cost: €{plan_cost(jit_plan, jit_inventory, setup_cost, holding_cost, unit_cost):.2f}
 - Production Setups: {sum(1 for p in jit_plan if p > 0)}
 - Total Production: {sum(jit_plan)} units
 - Average Inventory: {sum(jit_inventory)/len(jit_inventory):.1f} units
 """   
 
-def save_results_to_csv(periods, demand, ww_plan, ww_inventory, jit_plan, jit_inventory, setup_cost, holding_cost):
+def save_results_to_csv(periods, demand, ww_plan, ww_inventory, jit_plan, jit_inventory, setup_cost, holding_cost, unit_cost=0):
 	try:
 		root_dir = Path(__file__).resolve().parent.parent
 		results_dir = root_dir / "Results"
@@ -163,7 +328,8 @@ def save_results_to_csv(periods, demand, ww_plan, ww_inventory, jit_plan, jit_in
 		print(f"Results saved to {csv_file}")
 
 		# SAVE SUMMARY
-		summary = make_summary(periods, demand, ww_plan, ww_inventory, jit_plan, jit_inventory, setup_cost, holding_cost)
+		summary = make_summary(periods, demand, ww_plan, ww_inventory, jit_plan, jit_inventory, setup_cost, holding_cost,
+			unit_cost)
 		with open(summary_file, 'w') as f:
 			f.write(summary)
 		print(f"Summary saved to {summary_file}")
@@ -204,27 +370,37 @@ def run_lot_sizing(data=None):
 	# EXTRACT DATA
 	periods = data['periods']
 	demand = data['demand']
-	setup_cost = data['setup_cost']
-	holding_cost = data['holding_cost']
+	# PER-PERIOD COSTS FROM A CSV, OTHERWISE THE SAME COST IN EVERY PERIOD
+	setup_cost = data.get('setup_costs', data['setup_cost'])
+	holding_cost = data.get('holding_costs', data['holding_cost'])
+	unit_cost = data.get('unit_costs', 0)
 	initial_inventory = data['initial_inventory']
 	
 	# RUN WAGNER-WITHIN ALGORITHM
 	ww_plan, ww_inventory, ww_cost = ww.wagner_whitin_algorithm(
-		demand, setup_cost, holding_cost, initial_inventory)
+		demand, setup_cost, holding_cost, initial_inventory, unit_cost)
 	
 	# RUN JIT HEURISTIC
 	jit_plan, jit_inventory, jit_cost = jit.jit_heuristic(
-		demand, setup_cost, holding_cost, initial_inventory)
+		demand, setup_cost, holding_cost, initial_inventory, unit_cost)
 	
 	# DISPLAY RESULTS
 	display_results(periods, demand, ww_plan, ww_inventory, ww_cost,
 		jit_plan, jit_inventory, jit_cost, setup_cost, holding_cost)
 	
+	# RUN CAPACITATED LOT SIZING (EXACT MILP FOR SHORT HORIZONS, HEURISTIC FOR LONG ONES)
+	try:
+		cap_result = cap.capacitated_lot_sizing(demand, setup_cost, holding_cost,
+			data['min_production'], data['max_production'], initial_inventory, unit_cost=unit_cost)
+		display_capacitated_results(cap_result, data['min_production'], data['max_production'])
+	except ValueError as e:
+		print(f"\nCapacitated lot sizing not possible: {e}")
+
 	# ASK IF USER WANTS TO SAVE RESULTS
 	save = input("\nSave results to CSV? (y/n): ").lower()
 	if save == 'y':
 		save_results_to_csv(periods, demand, ww_plan, ww_inventory, 
-			jit_plan, jit_inventory, setup_cost, holding_cost)
+			jit_plan, jit_inventory, setup_cost, holding_cost, unit_cost)
 	return periods, ww_plan, ww_inventory, jit_plan, jit_inventory
 
 def main():
@@ -0,0 +1,130 @@
+from Lot_sizing import wagner_within as ww
+
+# ROLLING-HORIZON WAGNER-WITHIN: THE DP ARRAYS ARE KEPT BETWEEN REPLANNING CYCLES
+# APPENDING PERIODS OR CHANGING THE FORECASTS FROM PERIOD t ON ONLY RECOMPUTES F[t+1..n],
+# F[0..t] ONLY DEPENDS ON THE DEMAND BEFORE PERIOD t AND STAYS VALID
+#
+# PLANNING HORIZON THEOREM (WAGNER-WITHIN): WITH NON-SPECULATIVE COSTS (unit[p] + holding[p] >= unit[p+1],
+# PRODUCING EARLY IS NEVER CHEAPER PER UNIT) THE LAST SETUP NEVER MOVES BACK WHEN THE HORIZON GROWS,
+# SO prev[i] >= prev[i-1] AND THE SEARCH FOR F[i] STARTS AT prev[i-1].
+# IF THE BEST PLAN FOR PERIODS 0..r SETS UP IN PERIOD r ITSELF (prev[r+1] == r), EVERY LONGER PLAN HAS A SETUP
+# IN PERIOD r TOO AND PERIODS 0..r-1 ARE FROZEN: LATER PERIODS OR FORECASTS CAN NO LONGER CHANGE THEM
+class RollingHorizonPlanner:
+	def __init__(self, setup_cost, holding_cost, unit_cost=0, initial_inventory=0, demands=()):
+		# DEFAULT COSTS FOR NEW PERIODS
+		self.setup_cost = setup_cost
+		self.holding_cost = holding_cost
+		self.unit_cost = unit_cost
+		self.initial_inventory = initial_inventory
+
+		# PER-PERIOD INPUTS
+		self.demands = []
+		self.setup = []
+		self.holding = []
+		self.unit = []
+
+		# PREFIX SUMS WITH A LEADING ZERO: DEMAND, HOLDING COST H AND DEMAND * H
+		self.cumsum = [0]
+		self.H = [0]
+		self.G = [0]
+
+		# DP ARRAYS, SAME MEANING AS IN wagner_whitin_algorithm
+		self.F = [0.0]
+		self.prev = [-1]
+
+		if len(demands) > 0:
+			self.append(demands)
+
+	def __len__(self):
+		return len(self.demands)
+
+	# TRUE WHEN THE PLANNING HORIZON THEOREM HOLDS FOR THE CURRENT COSTS
+	def non_speculative(self):
+		return all(self.unit[p] + self.holding[p] >= self.unit[p + 1] for p in range(len(self.demands) - 1))
+
+	# ADD NEW PERIODS AT THE END OF THE HORIZON, COSTS ARE ONE VALUE OR ONE VALUE PER NEW PERIOD
+	def append(self, demands, setup_cost=None, holding_cost=None, unit_cost=None):
+		start = len(self.demands)
+		self._add_periods(demands, setup_cost, holding_cost, unit_cost)
+		self._solve_from(start)
+
+	# NEW FORECAST FROM PERIOD start ON: demands REPLACES EVERYTHING FROM start (THE HORIZON MAY GROW OR SHRINK)
+	# COSTS THAT ARE NOT GIVEN STAY AS THEY WERE, PERIODS THAT DID NOT EXIST YET GET THE DEFAULT COSTS
+	def update_tail(self, start, demands, setup_cost=None, holding_cost=None, unit_cost=None):
+		if start < 0 or start > len(self.demands):
+			raise ValueError(f"Start period {start} is outside the horizon (0..{len(self.demands)})")
+		demands = list(demands)
+		setup = self._tail_costs(setup_cost, self.setup, self.setup_cost, start, len(demands))
+		holding = self._tail_costs(holding_cost, self.holding, self.holding_cost, start, len(demands))
+		unit = self._tail_costs(unit_cost, self.unit, self.unit_cost, start, len(demands))
+
+		# DROP THE OLD TAIL, PREFIX SUMS UP TO start STAY VALID
+		del self.demands[start:], self.setup[start:], self.holding[start:], self.unit[start:]
+		del self.cumsum[start + 1:], self.H[start + 1:], self.G[start + 1:]
+		self._add_periods(demands, setup, holding, unit)
+		self._solve_from(start)
+
+	# CURRENT OPTIMAL PLAN: (PRODUCTION PLAN, INVENTORY LEVELS, TOTAL COST) LIKE wagner_whitin_algorithm
+	def plan(self):
+		n = len(self.demands)
+		if n == 0 or self.cumsum[n] == 0:
+			return [0]*n, [0]*n, 0.0
+		production_plan, inventory_levels = ww.build_plan(self.demands, self.cumsum, self.prev, self.initial_inventory)
+		return production_plan, inventory_levels, self.F[n]
+
+	# NUMBER OF LEADING PERIODS r WHOSE PRODUCTION CAN NO LONGER CHANGE: THE LATEST r WITH prev[r+1] == r
+	# (HOLDS FOR APPENDS AND FORECAST UPDATES AFTER PERIOD r, WITH NON-SPECULATIVE COSTS)
+	def frozen_periods(self):
+		if not self.non_speculative():
+			return 0
+		for i in range(len(self.demands), 0, -1):
+			if self.prev[i] == i - 1:
+				return i - 1
+		return 0
+
+	# PRODUCTION QUANTITIES OF THE FROZEN PERIODS, THESE CAN BE RELEASED
+	def frozen_plan(self):
+		return self.plan()[0][:self.frozen_periods()]
+
+	# SCALAR OR PER-PERIOD COSTS FOR n NEW PERIODS, None MEANS THE PLANNER'S DEFAULT
+	def _new_costs(self, value, default, n):
+		return ww.per_period(default if value is None else value, n)
+
+	def _tail_costs(self, value, current, default, start, n):
+		if value is not None:
+			return ww.per_period(value, n)
+		kept = current[start:start + n]
+		return kept + [default] * (n - len(kept))
+
+	def _add_periods(self, demands, setup_cost, holding_cost, unit_cost):
+		demands = list(demands)
+		n = len(demands)
+		self.setup += self._new_costs(setup_cost, self.setup_cost, n)
+		self.holding += self._new_costs(holding_cost, self.holding_cost, n)
+		self.unit += self._new_costs(unit_cost, self.unit_cost, n)
+		for d in demands:
+			t = len(self.demands)
+			self.demands.append(d)
+			self.cumsum.append(self.cumsum[t] + d)
+			self.G.append(self.G[t] + d * self.H[t])
+			self.H.append(self.H[t] + self.holding[t])
+
+	# RECOMPUTE F[start+1..n] AND prev[start+1..n], EVERYTHING UP TO start IS STILL VALID
+	def _solve_from(self, start):
+		n = len(self.demands)
+		del self.F[start + 1:], self.prev[start + 1:]
+		monotone = self.non_speculative()
+		cumsum, G, H = self.cumsum, self.G, self.H
+		for i in range(start + 1, n + 1):
+			best_cost = float('inf')
+			best = -1
+			# LAST SETUP CANNOT BE EARLIER THAN THE ONE FOR THE SHORTER HORIZON
+			first = max(self.prev[i - 1], 0) if monotone else 0
+			for j in range(first, i):
+				cost = (self.F[j] + self.setup[j] + (self.unit[j] - H[j]) * (cumsum[i] - cumsum[j])
+					+ G[i] - G[j])
+				if cost < best_cost:	# STRICT, SO TIES GO TO THE EARLIEST PERIOD
+					best_cost = cost
+					best = j
+			self.F.append(best_cost)
+			self.prev.append(best)
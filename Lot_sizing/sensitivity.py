@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from Lot_sizing import wagner_within as ww
+from Lot_sizing import capacitated as cap
+
+# PARAMETRIC SWEEP OVER THE SETUP / HOLDING COST RATIO
+# THE SETUP COST OF PERIOD t IS ratio * setup_cost[t], HOLDING AND UNIT COSTS STAY FIXED
+# (WITH THE DEFAULT setup_cost=1 AND holding_cost=1, ratio IS EXACTLY THE SETUP / HOLDING COST RATIO)
+#
+# A PLAN WITH SETUP WEIGHT A (SUM OF setup_cost OVER ITS SETUPS) AND OTHER COSTS B COSTS ratio * A + B,
+# SO THE OPTIMAL COST IS THE LOWER ENVELOPE OF ONE LINE PER PLAN. THE BREAKPOINTS ARE FOUND LIKE EISNER-SEVERANCE:
+# SOLVE BOTH ENDS, SOLVE WHERE THEIR LINES CROSS, AND ONLY SPLIT THE INTERVAL WHEN THAT FINDS A NEW, CHEAPER PLAN
+# EVERY OPTIMAL PLAN IS SOLVED ONCE OR TWICE, INSTEAD OF ONCE PER GRID POINT
+
+# RELATIVE TOLERANCE FOR "SAME COST" WHEN COMPARING LINES
+TOLERANCE = 1e-9
+
+# OPTIMAL PLAN FOR ONE RATIO, WITH ITS SETUP WEIGHT A AND OTHER COSTS B
+def solve_ratio(ratio, demand, setup_cost, holding_cost, unit_cost=0, initial_inventory=0):
+	n = len(demand)
+	setup_cost = ww.per_period(setup_cost, n)
+	net = cap.net_demand(demand, initial_inventory)
+	# LEADING PERIODS WITHOUT NET DEMAND NEED NO SETUP (WAGNER-WITHIN WOULD PAY ONE FOR THEM)
+	first = next((t for t, d in enumerate(net) if d > 0), n)
+	plan = [0] * first + ww.wagner_whitin_fast(net[first:], [ratio * k for k in setup_cost[first:]],
+		ww.per_period(holding_cost, n)[first:], unit_cost=ww.per_period(unit_cost, n)[first:])[0]
+	A = sum(setup_cost[t] for t in range(n) if plan[t] > 0)
+	B = cap.evaluate_plan(plan, demand, 0, holding_cost, initial_inventory, unit_cost)[1]
+	return plan, A, B
+
+# BREAKPOINTS OF THE OPTIMAL PLAN FOR min_ratio <= ratio <= max_ratio
+# RETURNS ONE ROW PER OPTIMAL PLAN: THE RATIO INTERVAL IT IS OPTIMAL IN, ITS SETUPS AND ITS COST AT BOTH ENDS
+def ratio_sweep(demand, min_ratio, max_ratio, setup_cost=1, holding_cost=1, unit_cost=0, initial_inventory=0):
+	if min_ratio < 0 or max_ratio < min_ratio:
+		raise ValueError(f"Invalid ratio range: {min_ratio} - {max_ratio}")
+
+	def solve(ratio):
+		return solve_ratio(ratio, demand, setup_cost, holding_cost, unit_cost, initial_inventory)
+
+	def cost(solution, ratio):
+		return ratio * solution[1] + solution[2]
+
+	# (RATIO FROM, RATIO TO, PLAN) IN RATIO ORDER, INTERVALS STILL TO CHECK ARE KEPT ON A STACK (LEFT ONE ON TOP)
+	segments = []
+	low, high = solve(min_ratio), solve(max_ratio)
+	stack = [(min_ratio, low, max_ratio, high)]
+	while stack:
+		left, left_plan, right, right_plan = stack.pop()
+		# SAME SETUP WEIGHT: BOTH ARE OPTIMAL AT BOTH ENDS, SO THEY COST THE SAME EVERYWHERE IN BETWEEN
+		if left_plan[1] == right_plan[1]:
+			segments.append((left, right, left_plan))
+			continue
+		# WHERE THE TWO LINES CROSS (FEWER SETUPS WIN FOR HIGHER RATIOS)
+		cross = (right_plan[2] - left_plan[2]) / (left_plan[1] - right_plan[1])
+		cross = min(max(cross, left), right)
+		middle = solve(cross)
+		if cost(middle, cross) >= cost(left_plan, cross) - TOLERANCE * max(1.0, abs(cost(left_plan, cross))):
+			# NOTHING CHEAPER AT THE CROSSING: IT IS A BREAKPOINT
+			segments.append((left, cross, left_plan))
+			segments.append((cross, right, right_plan))
+		else:
+			stack.append((cross, middle, right, right_plan))
+			stack.append((left, left_plan, cross, middle))
+
+	# NEIGHBOURING SEGMENTS WITH THE SAME PLAN ARE JOINED
+	rows = []
+	for left, right, (plan, A, B) in segments:
+		if rows and rows[-1]['plan'] == plan:
+			rows[-1]['ratio_to'] = right
+			rows[-1]['cost_to'] = right * A + B
+			continue
+		rows.append({
+			'ratio_from': left,
+			'ratio_to': right,
+			'setups': sum(1 for p in plan if p > 0),
+			'setup_periods': tuple(t for t, p in enumerate(plan) if p > 0),
+			'setup_weight': A,
+			'other_cost': B,
+			'cost_from': left * A + B,
+			'cost_to': right * A + B,
+			'plan': plan })
+	return pd.DataFrame(rows)
+
+# PLANS AND COSTS FOR MANY RATIOS FROM A SWEEP TABLE, WITHOUT SOLVING AGAIN
+def lookup(table, ratios):
+	ratios = np.atleast_1d(np.asarray(ratios, dtype=float))
+	if len(table) == 0 or ratios.min() < table['ratio_from'].iloc[0] or ratios.max() > table['ratio_to'].iloc[-1]:
+		raise ValueError("Ratios outside the range of the sweep")
+	rows = np.searchsorted(table['ratio_to'].to_numpy(), ratios, side='left')
+	result = table.iloc[rows][['setups', 'setup_periods', 'plan']].reset_index(drop=True)
+	result.insert(0, 'ratio', ratios)
+	result.insert(2, 'cost', ratios * table['setup_weight'].to_numpy()[rows] + table['other_cost'].to_numpy()[rows])
+	return result
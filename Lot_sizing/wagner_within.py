@@ -6,37 +6,23 @@ def compute_cumsum(array):
 		cumsum[i + 1] = cumsum[i] + array[i]
 	return cumsum
 
+# ONE VALUE PER PERIOD: A SCALAR IS REPEATED, A LIST MUST HAVE ONE VALUE FOR EVERY PERIOD
+def per_period(value, n):
+	try:
+		values = [float(v) for v in value]
+	except TypeError:
+		return [value] * n
+	if len(values) != n:
+		raise ValueError(f"Expected {n} per-period values, got {len(values)}")
+	return values
+
 # CALCULATING SUM BETWEEN i AND j
 def sum_between(cumsum, i, j):
 	return cumsum[j + 1] - cumsum[i]
 
-# WAGNER-WITHIN ALGORITHM
-def wagner_whitin_algorithm(demands, setup_cost, holding_cost_per_unit, initial_inventory=0):
+# BACKTRACKING FROM prev TO THE PRODUCTION PLAN AND INVENTORY LEVELS
+def build_plan(demands, cumsum, prev, initial_inventory=0):
 	n = len(demands)
-
-	#IF NO DEMAND RETURN FROM THE FUNCTION
-	if n == 0 or sum(demands) == 0:
-		return [0]*n, [0]*n, 0.0
-	cumsum = compute_cumsum(demands) #PRECOMPUTE CUMULLATIVE SUM FOR DEMAND
-
-	F = [float('inf')] * (n + 1) #CREATING AN N+1 LONG COST LIST WITH INFINITIES
-	F[0] = 0
-	prev = [-1] * (n + 1) #STORES IN WHICH PERIOD THE LAST PRODUCTION WAS MADE
-	for i in range(1, n + 1):
-		for j in range(1, i + 1):
-			holding = 0
-			# CALCULATE HOLDING COST FOR INVENTORY CARRIED
-			for k in range(j, i):
-				# INVENTORY HELD FROM PERIOD k TO i-1
-				holding += sum_between(cumsum, k, i - 1) * holding_cost_per_unit
-			# TOTAL COST = PREVIOUS COST + SETUP COST + HOLDING COST
-			cost = F[j - 1] + setup_cost + holding
-			# KEEP THE CHEAPEST OPTION
-			if cost < F[i]:
-				F[i] = cost
-				prev[i] = j - 1
-
-	# INITIALIZE OUTPUT STRUCTURES
 	production_plan = [0] * n
 	inventory = initial_inventory
 	inventory_levels = [0] * n
@@ -55,4 +41,116 @@ def wagner_whitin_algorithm(demands, setup_cost, holding_cost_per_unit, initial_
 		inventory -= demands[t]	# SUBTRACT DEMAND
 		inventory_levels[t] = inventory # STORE INVENTORY LEVEL
 
+	return production_plan, inventory_levels
+
+# WAGNER-WITHIN ALGORITHM, O(n^2)
+# SETUP, HOLDING AND UNIT COSTS CAN BE ONE VALUE OR ONE VALUE PER PERIOD
+def wagner_whitin_algorithm(demands, setup_cost, holding_cost_per_unit, initial_inventory=0, unit_cost=0):
+	n = len(demands)
+
+	#IF NO DEMAND RETURN FROM THE FUNCTION
+	if n == 0 or sum(demands) == 0:
+		return [0]*n, [0]*n, 0.0
+	cumsum = compute_cumsum(demands) #PRECOMPUTE CUMULLATIVE SUM FOR DEMAND
+	setup = per_period(setup_cost, n)
+	holding_cost = per_period(holding_cost_per_unit, n)
+	unit = per_period(unit_cost, n)
+
+	F = [float('inf')] * (n + 1) #CREATING AN N+1 LONG COST LIST WITH INFINITIES
+	F[0] = 0
+	prev = [-1] * (n + 1) #STORES IN WHICH PERIOD THE LAST PRODUCTION WAS MADE
+	for i in range(1, n + 1):
+		holding = 0
+		# GOING BACKWARDS FROM j = i: PRODUCING ONE PERIOD EARLIER ADDS THE INVENTORY HELD AT THE END OF THAT PERIOD
+		for j in range(i, 0, -1):
+			if j < i:
+				holding += sum_between(cumsum, j, i - 1) * holding_cost[j - 1]
+			# TOTAL COST = PREVIOUS COST + SETUP COST + PRODUCTION COST + HOLDING COST
+			cost = F[j - 1] + setup[j - 1] + unit[j - 1] * sum_between(cumsum, j - 1, i - 1) + holding
+			# KEEP THE CHEAPEST OPTION (<= SO THAT TIES GO TO THE EARLIEST PERIOD)
+			if cost <= F[i]:
+				F[i] = cost
+				prev[i] = j - 1
+
+	production_plan, inventory_levels = build_plan(demands, cumsum, prev, initial_inventory)
+	return production_plan, inventory_levels, F[n]
+
+# WAGNER-WITHIN ALGORITHM, O(n log n)
+# COST OF PRODUCING IN PERIOD p FOR PERIODS p..q IS A LINE IN THE CUMULATIVE DEMAND UP TO q:
+#   F[p] + K[p] + (c[p] - H[p]) * (C[q+1] - C[p]) + G[q+1] - G[p]
+#   (C: CUMULATIVE DEMAND, H: CUMULATIVE HOLDING COST, G: CUMULATIVE DEMAND * H, K/c: SETUP/UNIT COST OF PERIOD p)
+# SO EVERY F[q+1] IS A LOWER-ENVELOPE QUERY OVER ONE LINE PER PERIOD (LI CHAO TREE OVER THE QUERY POINTS)
+def wagner_whitin_fast(demands, setup_cost, holding_cost_per_unit, initial_inventory=0, unit_cost=0):
+	n = len(demands)
+
+	#IF NO DEMAND RETURN FROM THE FUNCTION
+	if n == 0 or sum(demands) == 0:
+		return [0]*n, [0]*n, 0.0
+	cumsum = compute_cumsum(demands)
+	setup = per_period(setup_cost, n)
+	unit = per_period(unit_cost, n)
+	# HOLDING FROM THE END OF PERIOD p TO THE START OF PERIOD t COSTS H[t] - H[p] PER UNIT
+	H = compute_cumsum(per_period(holding_cost_per_unit, n))
+	G = compute_cumsum([demands[t] * H[t] for t in range(n)])
+
+	F = [0.0] * (n + 1)
+	prev = [-1] * (n + 1)
+	slope = [0.0] * n
+	intercept = [0.0] * n
+
+	# QUERY POINTS ARE KNOWN UPFRONT: CUMULATIVE DEMAND AT THE END OF EVERY PERIOD
+	xs = sorted(set(cumsum[1:]))
+	index_of = {x: i for i, x in enumerate(xs)}
+	tree = [-1] * (4 * len(xs))
+
+	def better(a, b, x):
+		# LOWER VALUE WINS, TIES GO TO THE EARLIER PERIOD (SAME CHOICE AS THE O(n^2) VERSION)
+		value_a = slope[a] * x + intercept[a]
+		value_b = slope[b] * x + intercept[b]
+		return value_a < value_b or (value_a == value_b and a < b)
+
+	def insert(p):
+		node, lo, hi = 1, 0, len(xs) - 1
+		while True:
+			if tree[node] < 0:
+				tree[node] = p
+				return
+			mid = (lo + hi) // 2
+			if better(p, tree[node], xs[mid]):
+				tree[node], p = p, tree[node]	# NODE KEEPS THE LINE THAT WINS IN THE MIDDLE
+			if lo == hi:
+				return
+			if better(p, tree[node], xs[lo]):
+				node, hi = 2 * node, mid
+			elif better(p, tree[node], xs[hi]):
+				node, lo = 2 * node + 1, mid + 1
+			else:
+				return	# LOSES EVERYWHERE IN THIS RANGE
+
+	def query(x):
+		node, lo, hi = 1, 0, len(xs) - 1
+		target = index_of[x]
+		best = -1
+		while tree[node] >= 0:
+			if best < 0 or better(tree[node], best, x):
+				best = tree[node]
+			if lo == hi:
+				break
+			mid = (lo + hi) // 2
+			if target <= mid:
+				node, hi = 2 * node, mid
+			else:
+				node, lo = 2 * node + 1, mid + 1
+		return best
+
+	for q in range(n):
+		# LINE FOR PRODUCING IN PERIOD q, F[q] IS FINAL AT THIS POINT
+		slope[q] = unit[q] - H[q]
+		intercept[q] = F[q] + setup[q] - slope[q] * cumsum[q] - G[q]
+		insert(q)
+		p = query(cumsum[q + 1])
+		prev[q + 1] = p
+		F[q + 1] = F[p] + setup[p] + slope[p] * (cumsum[q + 1] - cumsum[p]) + G[q + 1] - G[p]
+
+	production_plan, inventory_levels = build_plan(demands, cumsum, prev, initial_inventory)
 	return production_plan, inventory_levels, F[n]
@@ -3,6 +3,7 @@
 #Importing required libraries:
 from pathlib import Path  # Path Management
 import os  # Environment
+import numpy as np #Matrix handling
 import pandas as pd #Data handling
 import pulp #Linear programming
 ########################################################################################################################
@@ -19,6 +20,11 @@ MPS_DIR = BASE_DIR.parent / "Master_production_schedule"
 RESULTS_DIR = MPS_DIR / "Results"
 RESULTS_DIR.mkdir(exist_ok=True)
 
+#Name of the row holding the profit per product:
+PROFIT_ROW = "Profit per piece"
+#Printing at most this many products in the profit overview:
+MAX_PRINTED_PRODUCTS = 20
+
 #Loading & Cleaning Dataset:
 def load_mps_dataset(csv_file='mps_data.csv'):
     """
@@ -29,25 +35,49 @@ def load_mps_dataset(csv_file='mps_data.csv'):
     if not file_path.exists():
         raise FileNotFoundError(f".csv file not found: {file_path}")
     mps_dataset = pd.read_csv(file_path, sep=";")
-    #Rename columns for consistency and clarity
-    mps_dataset.columns = ["Resource", "Product_X", "Product_Y", "Product_Z", "Inventory"]
-    #Converting numeric columns to numbers (fix CSV string issue):
-    for col in ["Product_X", "Product_Y", "Product_Z", "Inventory"]:
-        mps_dataset[col] = pd.to_numeric(mps_dataset[col], errors="coerce")
+    #Rename columns for consistency and clarity (first = resource, last = inventory, every column in between = one product):
+    mps_dataset = mps_dataset.rename(columns={
+        mps_dataset.columns[0]: "Resource",
+        mps_dataset.columns[-1]: "Inventory"
+    })
+    #Converting numeric columns to numbers in one go (fix CSV string issue):
+    numeric = product_columns(mps_dataset) + ["Inventory"]
+    mps_dataset[numeric] = mps_dataset[numeric].apply(pd.to_numeric, errors="coerce")
     #Dropping completely empty rows (safety check):
     mps_dataset = mps_dataset.dropna(subset=["Resource"])
     return mps_dataset
 
+#Product columns and their names:
+def product_columns(mps_dataset):
+    """
+    Returns the product columns (everything between Resource and Inventory).
+    """
+    return [col for col in mps_dataset.columns if col not in ("Resource", "Inventory")]
+
+def product_label(column):
+    """
+    Display name of a product column, e.g. Product_X -> Product X.
+    """
+    return column.replace("_", " ")
+
+def product_short_name(column):
+    """
+    Name typed by the user, e.g. Product_X -> X.
+    """
+    return column[len("Product_"):] if column.startswith("Product_") else column
+
 #Defining Functions for printing Profits as well as current MPS-data:
 def print_profit_summary(mps_dataset):
     """
     Prints a compact profit overview for each product.
     """
-    profit = mps_dataset[mps_dataset["Resource"] == "Profit per piece"].iloc[0]
+    profit = mps_dataset[mps_dataset["Resource"] == PROFIT_ROW].iloc[0]
+    products = product_columns(mps_dataset)
     print("\n--- PROFIT PER PRODUCT ---")
-    print(f"Product X: {profit['Product_X']}")
-    print(f"Product Y: {profit['Product_Y']}")
-    print(f"Product Z: {profit['Product_Z']}")
+    for column in products[:MAX_PRINTED_PRODUCTS]:
+        print(f"{product_label(column)}: {profit[column]}")
+    if len(products) > MAX_PRINTED_PRODUCTS:
+        print(f"... and {len(products) - MAX_PRINTED_PRODUCTS} more products")
 
 def show_mps_overview(mps_dataset):
     """
@@ -60,7 +90,7 @@ def show_mps_overview(mps_dataset):
     print_profit_summary(mps_dataset)
 
     print("\n--- RESOURCE CONSTRAINTS ---")
-    print(mps_dataset[mps_dataset["Resource"] != "Profit per piece"])
+    print(mps_dataset[mps_dataset["Resource"] != PROFIT_ROW])
 
 def refresh_view(mps_dataset):
     """
@@ -80,28 +110,20 @@ def split_mps_data(mps_dataset):
     - Inventory per resource
     - Resource consumption matrix
     """
+    products = product_columns(mps_dataset)
     #-----------------------------------
     #Step 1. Extracting profit information:
-    profit_row = mps_dataset[mps_dataset["Resource"] == "Profit per piece"]
-    profits = {
-        "Product_X": float(profit_row["Product_X"].values[0]),
-        "Product_Y": float(profit_row["Product_Y"].values[0]),
-        "Product_Z": float(profit_row["Product_Z"].values[0])
-    }
+    profit_row = mps_dataset[mps_dataset["Resource"] == PROFIT_ROW]
+    profits = profit_row[products].iloc[0].astype(float).to_dict()
     #-----------------------------------
     #Step 2. Removing profit row:
-    resource_mps_dataset = mps_dataset[mps_dataset["Resource"] != "Profit per piece"]
+    resource_mps_dataset = mps_dataset[mps_dataset["Resource"] != PROFIT_ROW]
     #-----------------------------------
     #Step 3. Inventory (resource limits):
-    inventories = {
-        row["Resource"]: row["Inventory"]
-        for _, row in resource_mps_dataset.iterrows()
-    }
+    inventories = dict(zip(resource_mps_dataset["Resource"], resource_mps_dataset["Inventory"]))
     #-----------------------------------
     #Step 4. Consumption coefficients:
-    consumption = resource_mps_dataset.set_index("Resource")[[
-        "Product_X", "Product_Y", "Product_Z"
-    ]]
+    consumption = resource_mps_dataset.set_index("Resource")[products]
     return profits, inventories, consumption
 
 #Building & Solving the MPS Model:
@@ -109,44 +131,157 @@ def solve_mps(profits, inventories, consumption):
     """
     Solves the Master Production Schedule using Linear Programming.
     """
-    #-----------------------------------
-    #Step 1. Creating optimization model:
-    model = pulp.LpProblem("Master_Production_Schedule", pulp.LpMaximize)
-    #-----------------------------------
-    #Step 2. Defining the Decision variables (Assumption of no real Minimum/Maximum Production Constraints!):
-    x_x = pulp.LpVariable("Produce_X", lowBound=0, cat="Integer")
-    y_y = pulp.LpVariable("Produce_Y", lowBound=0, cat="Integer")
-    z_z = pulp.LpVariable("Produce_Z", lowBound=0, cat="Integer")
-    #-----------------------------------
-    #Step 3. Defining the Objective function:
-    model += (
-        profits["Product_X"] * x_x +
-        profits["Product_Y"] * y_y +
-        profits["Product_Z"] * z_z
-    ), "Total_Profit"
-    #-----------------------------------
-    #Step 4. Resource constraints:
-    for resource in inventories:
-        model += (
-            consumption.loc[resource, "Product_X"] * x_x +
-            consumption.loc[resource, "Product_Y"] * y_y +
-            consumption.loc[resource, "Product_Z"] * z_z
-        ) <= inventories[resource], f"Constraint_{resource}"
-    #-----------------------------------
-    #Step 5. Solving MPS model:
-    model.solve(pulp.PULP_CBC_CMD(msg=False))
-    #-----------------------------------
-    #Step 6. Collecting results:
-    results = {
-        "status": pulp.LpStatus[model.status],
-        "total_profit": pulp.value(model.objective),
-        "production_plan": {
-            "Product X": x_x.value(),
-            "Product Y": y_y.value(),
-            "Product Z": z_z.value()
+    #Bringing the data into matrix form (rows = resources, columns = products):
+    products = list(consumption.columns)
+    resources = list(inventories)
+    matrix = consumption.loc[resources, products].to_numpy(dtype=float)
+    return solve_mps_matrix(
+        [profits[product] for product in products],
+        [inventories[resource] for resource in resources],
+        matrix, products, resources
+    )
+
+#Sparse rows of a consumption matrix:
+def sparse_rows(matrix):
+    """
+    Returns (indptr, indices, data) of the nonzero coefficients, row by row (CSR layout).
+    Accepts a dense array or any sparse matrix with a .tocsr() method.
+    """
+    if hasattr(matrix, "tocsr"):
+        csr = matrix.tocsr()
+        return csr.indptr, csr.indices, csr.data
+    matrix = np.nan_to_num(np.asarray(matrix, dtype=float))
+    rows, cols = np.nonzero(matrix)
+    indptr = np.searchsorted(rows, np.arange(matrix.shape[0] + 1))
+    return indptr, cols, matrix[rows, cols]
+
+#Building & Solving the MPS Model in Matrix Form:
+def solve_mps_matrix(profits, inventories, consumption, products, resources, integer=True):
+    """
+    Solves max profits @ x subject to consumption @ x <= inventories, x >= 0.
+    The constraints are built from the nonzeros only, so build time grows with the nonzeros.
+    """
+    return MpsModel(profits, inventories, consumption, products, resources, integer).solve()
+
+#Persistent MPS Model (edits + warm-started re-solves):
+class MpsModel:
+    """
+    Keeps the PuLP model between solves.
+    Edits only change one coefficient or right-hand side, and every re-solve
+    starts CBC from the previous solution (MIP start).
+    """
+    def __init__(self, profits, inventories, consumption, products, resources, integer=True):
+        self.products = list(products)
+        self.resources = list(resources)
+        self.solved = False
+        #-----------------------------------
+        #Step 1. Creating optimization model:
+        self.model = pulp.LpProblem("Master_Production_Schedule", pulp.LpMaximize)
+        #-----------------------------------
+        #Step 2. Defining the Decision variables (Assumption of no real Minimum/Maximum Production Constraints!):
+        category = "Integer" if integer else "Continuous"
+        self.variables = {
+            product: pulp.LpVariable(f"Produce_{product_short_name(product)}", lowBound=0, cat=category)
+            for product in self.products
+        }
+        variables = list(self.variables.values())
+        #-----------------------------------
+        #Step 3. Defining the Objective function (every product, so profits can be changed later):
+        self.model += pulp.LpAffineExpression(
+            [(variable, float(profit)) for variable, profit in zip(variables, profits)]
+        ), "Total_Profit"
+        #-----------------------------------
+        #Step 4. Resource constraints (one sparse row each):
+        indptr, indices, data = sparse_rows(consumption)
+        self.constraints = {}
+        for i, resource in enumerate(self.resources):
+            start, end = indptr[i], indptr[i + 1]
+            row = pulp.LpAffineExpression(
+                [(variables[j], float(value)) for j, value in zip(indices[start:end], data[start:end])]
+            )
+            constraint = pulp.LpConstraint(row, pulp.LpConstraintLE, rhs=float(inventories[i]))
+            self.model += constraint, f"Constraint_{resource}"
+            self.constraints[resource] = constraint
+
+    @classmethod
+    def from_dataset(cls, mps_dataset, integer=True):
+        """
+        Builds the model from an MPS dataset (see load_mps_dataset).
+        """
+        profits, inventories, consumption = split_mps_data(mps_dataset)
+        products = list(consumption.columns)
+        resources = list(inventories)
+        return cls(
+            [profits[product] for product in products],
+            [inventories[resource] for resource in resources],
+            consumption.loc[resources, products].to_numpy(dtype=float),
+            products, resources, integer
+        )
+
+    #Edits (products are column names like Product_X, resources are row names like Material A):
+    def set_profit(self, product, value):
+        """
+        Changes the objective coefficient of one product.
+        """
+        self.model.objective[self.variables[product]] = float(value)
+
+    def set_inventory(self, resource, value):
+        """
+        Changes the right-hand side of one resource constraint.
+        """
+        self.constraints[resource].changeRHS(float(value))
+
+    def set_consumption(self, resource, product, value):
+        """
+        Changes the use of one resource by one product.
+        """
+        constraint = self.constraints[resource]
+        row = getattr(constraint, "expr", constraint)  #Older PuLP: the constraint is the expression
+        if value == 0:
+            row.pop(self.variables[product], None)
+        else:
+            row[self.variables[product]] = float(value)
+
+    def apply_change(self, change):
+        """
+        Applies a change returned by update_profit, update_inventory or update_resource_use.
+        """
+        kind, *arguments = change
+        if kind == "profit":
+            self.set_profit(*arguments)
+        elif kind == "inventory":
+            #The profit row has no constraint (its inventory is not used by the model):
+            if arguments[0] != PROFIT_ROW:
+                self.set_inventory(*arguments)
+        elif kind == "resource_use":
+            resource, product, value = arguments
+            #"Resource use" of the profit row = profit of the product (as when the dataset is solved again):
+            if resource == PROFIT_ROW:
+                self.set_profit(product, value)
+            else:
+                self.set_consumption(resource, product, value)
+        else:
+            raise ValueError(f"Unknown MPS change: {kind}")
+
+    def solve(self):
+        """
+        Solves the model, warm-started from the previous solution after the first solve.
+        """
+        #-----------------------------------
+        #Step 5. Solving MPS model:
+        self.model.solve(pulp.PULP_CBC_CMD(msg=False, warmStart=self.solved))
+        self.solved = True
+        #-----------------------------------
+        #Step 6. Collecting results:
+        results = {
+            "status": pulp.LpStatus[self.model.status],
+            "total_profit": pulp.value(self.model.objective),
+            "production_plan": {
+                product_label(product): variable.value()
+                for product, variable in self.variables.items()
+            }
         }
-    }
-    return results
+        return results
 
 #Displaying Results (for 1. MPS-Menu Output):
 def display_mps_results(results):
@@ -161,6 +296,24 @@ def display_mps_results(results):
     for product, quantity in results["production_plan"].items():
         print(f"  {product}: {quantity:.2f}")
 ########################################################################################################################
+#Products the user can choose from (typed name -> column):
+def product_choices(mps_dataset):
+    """
+    Maps the names the user can type (e.g. X) to the product columns (e.g. Product_X).
+    """
+    return {product_short_name(col).upper(): col for col in product_columns(mps_dataset)}
+
+def choice_hint(valid_products, last=None, limit=10):
+    """
+    Short list of the valid product names for prompts, e.g. "X, Y, Z" or "X, Y or Z".
+    """
+    names = list(valid_products)
+    if len(names) > limit:
+        return ", ".join(names[:limit]) + ", ..."
+    if last and len(names) > 1:
+        return ", ".join(names[:-1]) + f" {last} {names[-1]}"
+    return ", ".join(names)
+########################################################################################################################
 #1. Updating new profits:
 #Idea: "Enter the product you want to change:", then "Enter the new profit for this product:"
 def update_profit(mps_dataset):
@@ -168,13 +321,13 @@ def update_profit(mps_dataset):
     Updates the profit of a selected product.
     Re-prompts only the invalid input.
     """
-    valid_products = {"X", "Y", "Z"}
+    valid_products = product_choices(mps_dataset)
     #--- PRODUCT LOOP ---
     while True:
-        product = input("Enter the product you want to change (X, Y, Z): ").upper()
+        product = input(f"Enter the product you want to change ({choice_hint(valid_products)}): ").upper()
         if product in valid_products:
             break
-        print("Invalid product. Please choose X, Y or Z.")
+        print(f"Invalid product. Please choose {choice_hint(valid_products, last='or')}.")
     #--- PROFIT LOOP ---
     while True:
         try:
@@ -182,12 +335,13 @@ def update_profit(mps_dataset):
             break
         except ValueError:
             print("Invalid number. Please enter a numeric value.")
-    column_name = f"Product_{product}"
+    column_name = valid_products[product]
     mps_dataset.loc[
-        mps_dataset["Resource"] == "Profit per piece",
+        mps_dataset["Resource"] == PROFIT_ROW,
         column_name
     ] = new_profit
-    print(f"Profit for Product {product} updated successfully!")
+    print(f"Profit for {product_label(column_name)} updated successfully!")
+    return ("profit", column_name, new_profit)
 ########################################################################################################################
 #2. Updating new inventory:
 #Idea: "Enter the resource:", then "Enter the new inventory:"
@@ -215,6 +369,7 @@ def update_inventory(mps_dataset):
         "Inventory"
     ] = new_inventory
     print(f"Inventory for Resource {resource} updated successfully!")
+    return ("inventory", resource, new_inventory)
 ########################################################################################################################
 #3. Updating new resource use:
 #Idea: "Enter the product:", then "Enter the resource:", then "Enter the new resource use":
@@ -223,14 +378,14 @@ def update_resource_use(mps_dataset):
     Updates the resource consumption of a product.
     Re-prompts only the invalid input instead of restarting everything.
     """
-    valid_products = {"X", "Y", "Z"}
+    valid_products = product_choices(mps_dataset)
     resources = set(mps_dataset["Resource"])
     #--- PRODUCT LOOP ---
     while True:
-        product = input("Enter the product (X, Y, Z): ").upper()
+        product = input(f"Enter the product ({choice_hint(valid_products)}): ").upper()
         if product in valid_products:
             break
-        print("Invalid product. Please choose X, Y or Z.")
+        print(f"Invalid product. Please choose {choice_hint(valid_products, last='or')}.")
     #--- RESOURCE LOOP ---
     while True:
         resource = input("Enter the resource (e.g. Material A): ")
@@ -245,12 +400,13 @@ def update_resource_use(mps_dataset):
         except ValueError:
             print("Invalid number. Please enter a numeric value.")
     #Updating dataset:
-    column_name = f"Product_{product}"
+    column_name = valid_products[product]
     mps_dataset.loc[
         mps_dataset["Resource"] == resource,
         column_name
     ] = new_value
-    print(f"Resource use updated: {resource} → Product {product}")
+    print(f"Resource use updated: {resource} → {product_label(column_name)}")
+    return ("resource_use", resource, column_name, new_value)
 ########################################################################################################################
 #4. Saving data changes as .csv:
 #Idea: "Saving current dataset as .csv after selecting "2. Update profits", "3. Update inventory", "4. Update resource use" inside the folder "Master Production Schedule":
@@ -291,25 +447,15 @@ def save_mps_results(results, file_name="mps_results.csv"):
     summary_file = RESULTS_DIR / f"{base_name}_{timestamp}_summary.txt"
 
     #Saving as .csv file:
+    plan = results["production_plan"]
     data = pd.DataFrame({
-        "Metric": [
-            "Optimization Status",
-            "Maximum Profit",
-            "Product X",
-            "Product Y",
-            "Product Z"
-        ],
-        "Value/Quantity": [
-            results["status"],
-            results["total_profit"],
-            results["production_plan"]["Product X"],
-            results["production_plan"]["Product Y"],
-            results["production_plan"]["Product Z"]
-        ]
+        "Metric": ["Optimization Status", "Maximum Profit"] + list(plan),
+        "Value/Quantity": [results["status"], results["total_profit"]] + list(plan.values())
     })
     data.to_csv(csv_file, index=False)
 
     #Saving summary as .txt file:
+    plan_lines = "\n".join(f"- {product}: {quantity}" for product, quantity in plan.items())
     with open(summary_file, "w") as f:
         f.write(
             f"""Master Production Schedule Summary
@@ -319,9 +465,7 @@ Optimization Status: {results['status']}
 Maximum Profit: {results['total_profit']:.2f}
 
 Production Plan (Quantities):
-- Product X: {results['production_plan']['Product X']}
-- Product Y: {results['production_plan']['Product Y']}
-- Product Z: {results['production_plan']['Product Z']}
+{plan_lines}
 """
         )
     print(f"Results saved to:\n{csv_file}")
@@ -337,6 +481,8 @@ def run_mps_menu():
 
     #Remembering results of "1. Calculate optimal production quantities":
     last_results = None
+    #Model kept between calculations, edits are applied to it instead of rebuilding:
+    model = None
 
     #Printing mps-overview after selecting relevant menu-options:
     show_mps_overview(mps_dataset)
@@ -361,17 +507,23 @@ def run_mps_menu():
 
             #1. Updating profits:
             if choice == "1":
-                update_profit(mps_dataset)
+                change = update_profit(mps_dataset)
+                if model is not None:
+                    model.apply_change(change)
                 refresh_view(mps_dataset)
 
             #2. Updating inventory:
             elif choice == "2":
-                update_inventory(mps_dataset)
+                change = update_inventory(mps_dataset)
+                if model is not None:
+                    model.apply_change(change)
                 refresh_view(mps_dataset)
 
             #3. Updating resource use:
             elif choice == "3":
-                update_resource_use(mps_dataset)
+                change = update_resource_use(mps_dataset)
+                if model is not None:
+                    model.apply_change(change)
                 refresh_view(mps_dataset)
 
             #4. Saving data updates as .csv:
@@ -389,8 +541,9 @@ def run_mps_menu():
 
             #5. Calculating optimal production quantities:
             elif choice == "5":
-                profits, inventories, consumption = split_mps_data(mps_dataset)
-                last_results = solve_mps(profits, inventories, consumption)
+                if model is None:
+                    model = MpsModel.from_dataset(mps_dataset)
+                last_results = model.solve()
                 display_mps_results(last_results)
 
             #6. Saving optimal production quantities as .csv:
@@ -0,0 +1,257 @@
+#Multi-Period Master Production Schedule (sparse time-expanded model):
+########################################################################################################################
+#Importing required libraries:
+import numpy as np #Matrix handling
+import pandas as pd #Data handling
+import pulp #Linear programming
+from Master_production_schedule import mps
+########################################################################################################################
+#Idea: One copy of the single-period MPS per period, linked by the finished-goods inventory of every product:
+#   max   sum profit_j * sales_jt - holding_jt * stock_jt - setup_jt * setup_jt
+#   s.t.  stock_j,t-1 + production_jt - sales_jt - stock_jt = 0     (inventory carryover, stock_j,-1 = initial inventory)
+#         sum_j consumption_ij * production_jt <= limit_it         (resource limits of every period)
+#         production_jt - big_M_jt * setup_jt <= 0                  (only with setup costs)
+#         0 <= sales_jt <= demand_jt, setup_jt binary
+#The constraint matrix is assembled with numpy in coordinate form (row, column, value); the PuLP model is then
+#built from its sparse rows (one expression per row, no Python work per coefficient), like MpsModel.
+
+#Per-product / per-period values:
+def per_product_period(value, n_products, n_periods):
+    """
+    Returns a (products x periods) array from a scalar, one value per product (1-D)
+    or one value per product and period (2-D).
+    """
+    value = np.nan_to_num(np.asarray(value, dtype=float))
+    if value.ndim == 1:
+        value = value[:, None]
+    return np.broadcast_to(value, (n_products, n_periods)).copy()
+
+#Lot-Sizing Inputs -> Demand and Costs of the Multi-Period MPS:
+def lot_sizing_inputs(lot_sizing_data, products):
+    """
+    Takes demand, setup and holding costs from lot-sizing data (see Lot_sizing load_lot_sizing_data).
+    lot_sizing_data is one loaded dataset (used for every product) or {product column: loaded dataset}.
+    """
+    if "demand" in lot_sizing_data:
+        lot_sizing_data = {product: lot_sizing_data for product in products}
+    missing = [product for product in products if product not in lot_sizing_data]
+    if missing:
+        raise ValueError(f"No lot-sizing data for: {missing}")
+    datasets = [lot_sizing_data[product] for product in products]
+    lengths = {len(data["demand"]) for data in datasets}
+    if len(lengths) > 1:
+        raise ValueError("All lot-sizing datasets must cover the same number of periods")
+    return {
+        "demand": np.array([data["demand"] for data in datasets], dtype=float),
+        "setup_costs": np.array([data.get("setup_costs", data["setup_cost"]) for data in datasets], dtype=float),
+        "holding_costs": np.array([data.get("holding_costs", data["holding_cost"]) for data in datasets], dtype=float),
+        "initial_inventory": np.array([data.get("initial_inventory", 0) for data in datasets], dtype=float),
+        "periods": list(datasets[0].get("periods", range(1, lengths.pop() + 1)))
+    }
+
+#Multi-Period Model in Sparse Matrix Form:
+class MultiPeriodModel:
+    """
+    Time-expanded MPS: production, sales and inventory of every product in every period,
+    with per-period resource limits and optional setup/holding costs.
+    """
+    def __init__(self, profits, consumption, resource_limits, demand, products, resources, periods=None,
+                 setup_costs=None, holding_costs=None, initial_inventory=0, integer=True):
+        self.products = list(products)
+        self.resources = list(resources)
+        self.demand = np.nan_to_num(np.asarray(demand, dtype=float))
+        n, T = self.demand.shape
+        m = len(self.resources)
+        self.periods = list(periods) if periods is not None else list(range(1, T + 1))
+        if n != len(self.products) or len(self.periods) != T:
+            raise ValueError("Demand must have one row per product and one column per period")
+        self.integer = integer
+        self.limits = per_product_period(resource_limits, m, T)
+        holding = per_product_period(0 if holding_costs is None else holding_costs, n, T)
+        initial = np.broadcast_to(np.asarray(initial_inventory, dtype=float), (n,))
+        #-----------------------------------
+        #Step 1. Column blocks (entry [j, t] of a block is column offset + j * T + t):
+        #stock, sales, production, setups -> the integer columns (production if integer, setups) are the last ones
+        self.size = n * T
+        self.stock, self.sales, self.production = 0, self.size, 2 * self.size
+        self.setups = 3 * self.size if setup_costs is not None else None
+        self.n_columns = (4 if self.setups is not None else 3) * self.size
+        k = np.arange(self.size)
+        t = k % T
+        #-----------------------------------
+        #Step 2. Inventory balance rows (row j * T + t): stock_t-1 + production - sales - stock = -initial (t = 0) or 0
+        carry = k[t > 0]
+        rows = [k, k, k, carry]
+        cols = [self.production + k, self.sales + k, self.stock + k, self.stock + carry - 1]
+        values = [np.ones(self.size), -np.ones(self.size), -np.ones(self.size), np.ones(len(carry))]
+        senses = [np.full(self.size, pulp.LpConstraintEQ)]
+        rhs = [np.where(t == 0, -np.repeat(initial, T), 0.0)]
+        #-----------------------------------
+        #Step 3. Resource rows (row n * T + i * T + t), every nonzero consumption coefficient once per period:
+        self.resource_row = self.size
+        indptr, indices, data = mps.sparse_rows(consumption)
+        resource_of = np.repeat(np.arange(m), np.diff(indptr))
+        periods = np.tile(np.arange(T), len(data))
+        rows.append(self.resource_row + np.repeat(resource_of, T) * T + periods)
+        cols.append(self.production + np.repeat(indices, T) * T + periods)
+        values.append(np.repeat(data, T))
+        senses.append(np.full(m * T, pulp.LpConstraintLE))
+        rhs.append(self.limits.ravel())
+        #-----------------------------------
+        #Step 4. Setup rows (row n * T + m * T + j * T + t): production <= big_M * setup
+        objective_setups = None
+        if self.setups is not None:
+            #Big M: remaining demand of the product, or less when a resource runs out first
+            remaining = np.cumsum(self.demand[:, ::-1], axis=1)[:, ::-1]
+            capacity = np.full((n, T), np.inf)
+            with np.errstate(divide="ignore"):
+                per_unit = self.limits[resource_of] / data[:, None]
+            np.minimum.at(capacity, indices[data > 0], per_unit[data > 0])
+            big_m = np.maximum(np.minimum(remaining, capacity), 0.0).ravel()
+            setup_row = self.resource_row + m * T
+            rows += [setup_row + k, setup_row + k]
+            cols += [self.production + k, self.setups + k]
+            values += [np.ones(self.size), -big_m]
+            senses.append(np.full(self.size, pulp.LpConstraintLE))
+            rhs.append(np.zeros(self.size))
+            objective_setups = -per_product_period(setup_costs, n, T).ravel()
+        #-----------------------------------
+        #Step 5. Objective coefficients (profit on sales, minus holding and setup costs):
+        self.objective = np.zeros(self.n_columns)
+        self.objective[self.sales:self.sales + self.size] = np.repeat(np.asarray(profits, dtype=float), T)
+        self.objective[self.stock:self.stock + self.size] = -holding.ravel()
+        if objective_setups is not None:
+            self.objective[self.setups:] = objective_setups
+        #-----------------------------------
+        #Step 6. Sparse constraint matrix in coordinate form:
+        self.rows = np.concatenate(rows)
+        self.cols = np.concatenate(cols)
+        self.values = np.concatenate(values)
+        keep = self.values != 0
+        self.rows, self.cols, self.values = self.rows[keep], self.cols[keep], self.values[keep]
+        self.senses = np.concatenate(senses)
+        self.rhs = np.concatenate(rhs)
+        self.consumption_rows = resource_of, indices, data
+        #-----------------------------------
+        #Step 7. PuLP model:
+        self._build_model()
+
+    def _build_model(self):
+        """
+        Creates the PuLP variables, objective and constraints from the sparse matrix.
+        """
+        n, T = self.demand.shape
+        names = [mps.product_short_name(product) for product in self.products]
+        labels = [f"{name}_{t + 1}" for name in names for t in range(T)]  #[j, t] -> j * T + t, like the column blocks
+        self.model = pulp.LpProblem("Multi_Period_MPS", pulp.LpMaximize)
+        #-----------------------------------
+        #Step 1. Decision variables, block by block (column order of the matrix):
+        category = "Integer" if self.integer else "Continuous"
+        self.variables = [pulp.LpVariable(f"Stock_{label}", lowBound=0) for label in labels]
+        self.variables += [pulp.LpVariable(f"Sell_{label}", lowBound=0, upBound=demand)
+                           for label, demand in zip(labels, self.demand.ravel().tolist())]
+        self.variables += [pulp.LpVariable(f"Produce_{label}", lowBound=0, cat=category) for label in labels]
+        if self.setups is not None:
+            self.variables += [pulp.LpVariable(f"Setup_{label}", cat="Binary") for label in labels]
+        #-----------------------------------
+        #Step 2. Objective function:
+        objective = np.flatnonzero(self.objective)
+        self.model += pulp.LpAffineExpression(
+            zip([self.variables[j] for j in objective.tolist()], self.objective[objective].tolist())
+        ), "Total_Profit"
+        #-----------------------------------
+        #Step 3. Constraints, one sparse row each (CSR order of the coordinate entries):
+        order = np.argsort(self.rows, kind="stable")
+        indptr = np.searchsorted(self.rows[order], np.arange(len(self.rhs) + 1)).tolist()
+        entries = [self.variables[j] for j in self.cols[order].tolist()]
+        values = self.values[order].tolist()
+        row_names = [f"Balance_{label}" for label in labels]
+        row_names += [f"Constraint_{resource}_{t + 1}" for resource in self.resources for t in range(T)]
+        if self.setups is not None:
+            row_names += [f"Setup_{label}" for label in labels]
+        constraints = {}
+        for i, (sense, rhs, name) in enumerate(zip(self.senses.tolist(), self.rhs.tolist(), row_names)):
+            start, end = indptr[i], indptr[i + 1]
+            row = pulp.LpAffineExpression(zip(entries[start:end], values[start:end]))
+            constraints[name] = pulp.LpConstraint(row, sense, rhs=rhs)
+        self.model.extend(constraints)
+
+    @classmethod
+    def from_dataset(cls, mps_dataset, demand, resource_limits=None, periods=None, setup_costs=None,
+                     holding_costs=None, initial_inventory=0, integer=True):
+        """
+        Builds the model from an MPS dataset (see load_mps_dataset).
+        - demand: (products x periods) array, or DataFrame indexed by product columns (e.g. Product_X) with one column per period
+        - resource_limits: None (the dataset's inventory in every period), one value per resource,
+          (resources x periods) array, or DataFrame indexed by resource
+        """
+        profits, inventories, consumption = mps.split_mps_data(mps_dataset)
+        products = list(consumption.columns)
+        resources = list(inventories)
+        if isinstance(demand, pd.DataFrame):
+            periods = list(demand.columns) if periods is None else periods
+            demand = demand.loc[products]
+        if resource_limits is None:
+            resource_limits = [inventories[resource] for resource in resources]
+        elif isinstance(resource_limits, pd.DataFrame):
+            resource_limits = resource_limits.loc[resources]
+        return cls(
+            [profits[product] for product in products],
+            consumption.loc[resources, products].to_numpy(dtype=float),
+            resource_limits, demand, products, resources, periods,
+            setup_costs, holding_costs, initial_inventory, integer
+        )
+
+    def solve(self, time_limit=None):
+        """
+        Solves the model with CBC.
+        """
+        #Pure LPs: barrier first, much faster than simplex on the long, thin time-expanded matrix
+        mip = self.integer or self.setups is not None
+        self.model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit, options=[] if mip else ["barrier"]))
+        x = np.array([variable.value() or 0.0 for variable in self.variables])
+        return self.results(pulp.LpStatus[self.model.status], x)
+
+    def results(self, status, x):
+        """
+        Results in the solve_mps format, with one column per period.
+        """
+        n, T = self.demand.shape
+        index = pd.Index([mps.product_label(product) for product in self.products], name="Product")
+
+        def block(offset):
+            return pd.DataFrame(x[offset:offset + self.size].reshape(n, T), index=index, columns=self.periods)
+
+        production = x[self.production:self.production + self.size].reshape(n, T)
+        resource_of, indices, data = self.consumption_rows
+        resource_use = np.zeros((len(self.resources), T))
+        np.add.at(resource_use, resource_of, data[:, None] * production[indices])
+        results = {
+            "status": status,
+            "total_profit": float(self.objective @ x),
+            "production_plan": block(self.production),
+            "sales_plan": block(self.sales),
+            "inventory_plan": block(self.stock),
+            "resource_use": pd.DataFrame(resource_use, index=pd.Index(self.resources, name="Resource"),
+                                         columns=self.periods)
+        }
+        if self.setups is not None:
+            results["setup_plan"] = block(self.setups).round().astype(int)
+        return results
+########################################################################################################################
+#Solving the Multi-Period MPS:
+def solve_multi_period_mps(mps_dataset, demand, resource_limits=None, lot_sizing_data=None, integer=True, time_limit=None):
+    """
+    Solves the multi-period MPS for an MPS dataset (see MultiPeriodModel.from_dataset).
+    With lot_sizing_data (see lot_sizing_inputs) demand may be None; the demand, setup and holding costs
+    and the initial inventory are then taken from the lot-sizing data.
+    """
+    options = {}
+    if lot_sizing_data is not None:
+        options = lot_sizing_inputs(lot_sizing_data, mps.product_columns(mps_dataset))
+        if demand is None:
+            demand = options["demand"]
+        del options["demand"]
+    model = MultiPeriodModel.from_dataset(mps_dataset, demand, resource_limits, integer=integer, **options)
+    return model.solve(time_limit)
+########################################################################################################################
@@ -0,0 +1,103 @@
+#Batch Scenario Solving for the Master Production Schedule:
+########################################################################################################################
+#Importing required libraries:
+import os  # Environment
+import time  # Solve times
+from concurrent.futures import ProcessPoolExecutor  # Worker processes
+import numpy as np #Matrix handling
+import pandas as pd #Data handling
+from Master_production_schedule import mps
+########################################################################################################################
+#Set once per worker process by _init_worker (one model per worker, reused for all its scenarios):
+_model = None
+
+def _init_worker(indptr, indices, data, shape, products, resources, integer):
+    """
+    Builds the worker's model from the shared consumption matrix (sent once per worker, not per scenario).
+    """
+    global _model
+    consumption = np.zeros(shape)
+    rows = np.repeat(np.arange(shape[0]), np.diff(indptr))
+    consumption[rows, indices] = data
+    _model = mps.MpsModel(np.zeros(len(products)), np.zeros(len(resources)), consumption, products, resources, integer)
+
+def _solve_scenario(scenario):
+    """
+    Sets the profits and inventories of one scenario on the worker's model and solves it (warm-started).
+    """
+    name, profits, inventories = scenario
+    #-----------------------------------
+    #Step 1. Only objective coefficients and right-hand sides change between scenarios:
+    for product, profit in zip(_model.products, profits):
+        _model.set_profit(product, profit)
+    for resource, inventory in zip(_model.resources, inventories):
+        _model.set_inventory(resource, inventory)
+    #-----------------------------------
+    #Step 2. Solving and timing:
+    start = time.perf_counter()
+    results = _model.solve()
+    solve_seconds = time.perf_counter() - start
+    return {
+        "scenario": name,
+        "status": results["status"],
+        "total_profit": results["total_profit"],
+        "solve_seconds": solve_seconds,
+        **results["production_plan"]
+    }
+
+#Scenario Tables -> One Profit and One Inventory Vector per Scenario:
+def scenario_vectors(base, table, columns, names):
+    """
+    Returns a (scenarios x columns) array: the base values, overwritten by the columns given in the table.
+    """
+    vectors = np.tile(np.asarray(base, dtype=float), (len(names), 1))
+    if table is not None:
+        unknown = [col for col in table.columns if col not in columns]
+        if unknown:
+            raise ValueError(f"Unknown scenario columns: {unknown}")
+        for col in table.columns:
+            vectors[:, columns.index(col)] = table[col].to_numpy(dtype=float)
+    return vectors
+
+#Solving Many Scenarios in Parallel:
+def solve_mps_scenarios(mps_dataset, profit_scenarios=None, inventory_scenarios=None, workers=None, integer=True):
+    """
+    Solves one MPS per scenario on a pool of worker processes.
+    - profit_scenarios: DataFrame, one row per scenario, columns = products (e.g. Product_X)
+    - inventory_scenarios: DataFrame, one row per scenario, columns = resources (e.g. Material A)
+    Columns that are left out keep the values of mps_dataset. Both tables must have the same index (scenario names).
+    Returns one row per scenario with status, profit, solve time and production quantities.
+    """
+    #-----------------------------------
+    #Step 1. Base data and scenario names:
+    profits, inventories, consumption = mps.split_mps_data(mps_dataset)
+    products = list(consumption.columns)
+    resources = list(inventories)
+    tables = [table for table in (profit_scenarios, inventory_scenarios) if table is not None]
+    if not tables:
+        raise ValueError("No scenarios given")
+    names = list(tables[0].index)
+    if len(tables) == 2 and list(tables[1].index) != names:
+        raise ValueError("Profit and inventory scenarios must have the same index")
+    #-----------------------------------
+    #Step 2. One profit and one inventory vector per scenario:
+    profit_vectors = scenario_vectors([profits[p] for p in products], profit_scenarios, products, names)
+    inventory_vectors = scenario_vectors([inventories[r] for r in resources], inventory_scenarios, resources, names)
+    scenarios = list(zip(names, profit_vectors, inventory_vectors))
+    #-----------------------------------
+    #Step 3. Constant consumption matrix, sent to every worker once in sparse form:
+    matrix = consumption.loc[resources, products].to_numpy(dtype=float)
+    indptr, indices, data = mps.sparse_rows(matrix)
+    initargs = (indptr, indices, data, matrix.shape, products, resources, integer)
+    #-----------------------------------
+    #Step 4. Solving (in this process when only one worker is wanted):
+    workers = min(workers or os.cpu_count() or 1, len(scenarios))
+    if workers <= 1:
+        _init_worker(*initargs)
+        rows = [_solve_scenario(scenario) for scenario in scenarios]
+    else:
+        chunksize = max(1, len(scenarios) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            rows = list(pool.map(_solve_scenario, scenarios, chunksize=chunksize))
+    return pd.DataFrame(rows).set_index("scenario")
+########################################################################################################################
@@ -0,0 +1,237 @@
+#LP Relaxation with Shadow Prices and Ranging for the Master Production Schedule:
+########################################################################################################################
+#Importing required libraries:
+import numpy as np #Matrix handling
+import pandas as pd #Data handling
+from Master_production_schedule import mps
+########################################################################################################################
+#Relative tolerance for "zero" (slacks, reduced costs, basis checks):
+TOLERANCE = 1e-7
+
+#Idea: Solve the LP relaxation once, rebuild its optimal basis B with numpy and read everything off B:
+#- shadow prices y = B^-T c_B, reduced costs c - A^T y
+#- RHS ranging: the basic solution B^-1 b must stay >= 0 when one inventory changes
+#- objective ranging: the reduced costs must stay <= 0 when one profit changes
+#Inside these ranges the basis stays optimal, so a what-if is answered without calling the solver.
+class MpsSensitivity:
+    """
+    LP relaxation of the MPS with shadow prices, reduced costs and RHS/objective ranging.
+    """
+    def __init__(self, profits, inventories, consumption, products, resources):
+        self.products = list(products)
+        self.resources = list(resources)
+        self.c = np.asarray(profits, dtype=float)
+        self.b = np.asarray(inventories, dtype=float)
+        self.A = np.nan_to_num(np.asarray(consumption, dtype=float))
+        #-----------------------------------
+        #Step 1. Solving the LP relaxation with CBC:
+        model = mps.MpsModel(self.c, self.b, self.A, self.products, self.resources, integer=False)
+        results = model.solve()
+        self.status = results["status"]
+        #-----------------------------------
+        #Step 2. Optimal basis, solution, duals and ranges (exact = False when no optimal basis was found):
+        self.exact = False
+        if self.status == "Optimal":
+            x = np.array([model.variables[p].value() or 0.0 for p in self.products])
+            duals = np.array([model.constraints[r].pi or 0.0 for r in self.resources])
+            reduced = np.array([model.variables[p].dj or 0.0 for p in self.products])
+            self.exact = self._find_basis(x, duals, reduced)
+        if not self.exact:
+            #Falling back to the solver values (no ranging possible):
+            self.x = np.array([model.variables[p].value() or 0.0 for p in self.products])
+            self.y = np.array([model.constraints[r].pi or 0.0 for r in self.resources])
+            self.reduced_costs = np.array([model.variables[p].dj or 0.0 for p in self.products])
+        self.total_profit = float(self.c @ self.x)
+
+    def _find_basis(self, x, duals, reduced):
+        """
+        Picks m linearly independent basic columns of [A | I] and checks that they form an optimal basis.
+        """
+        m, n = self.A.shape
+        M = np.hstack([self.A, np.eye(m)])
+        slack = self.b - self.A @ x
+        #-----------------------------------
+        #Step 1. Columns that must be basic (positive values), then columns that may be basic at zero:
+        x_tol = TOLERANCE * max(1.0, np.abs(x).max(initial=0.0))
+        s_tol = TOLERANCE * (1.0 + np.abs(self.b))
+        must = [j for j in range(n) if x[j] > x_tol] + [n + i for i in range(m) if slack[i] > s_tol[i]]
+        may = [n + i for i in range(m) if slack[i] <= s_tol[i] and abs(duals[i]) <= TOLERANCE] + \
+              [j for j in range(n) if x[j] <= x_tol and abs(reduced[j]) <= TOLERANCE]
+        #-----------------------------------
+        #Step 2. Keeping only independent columns (Gram-Schmidt), until the basis is square:
+        basis = []
+        Q = np.zeros((m, 0))
+        for column in must + may + [n + i for i in range(m)]:
+            if len(basis) == m:
+                break
+            if column in basis:
+                continue
+            vector = M[:, column]
+            residual = vector - Q @ (Q.T @ vector)
+            norm = np.linalg.norm(residual)
+            if norm > TOLERANCE * max(1.0, np.linalg.norm(vector)):
+                basis.append(column)
+                Q = np.hstack([Q, (residual / norm)[:, None]])
+        if len(basis) < m:
+            return False
+        #-----------------------------------
+        #Step 3. Basic solution and duals from B:
+        B = M[:, basis]
+        costs = np.concatenate([self.c, np.zeros(m)])
+        try:
+            B_inv = np.linalg.inv(B)
+        except np.linalg.LinAlgError:
+            return False
+        x_B = B_inv @ self.b
+        y = B_inv.T @ costs[basis]
+        r = costs - M.T @ y  #Reduced costs of all columns (slack i: -y_i)
+        nonbasic = np.setdiff1d(np.arange(n + m), basis)
+        scale = max(1.0, np.abs(self.c).max(initial=0.0))
+        if (x_B < -x_tol).any() or (r[nonbasic] > TOLERANCE * scale).any():
+            return False  #Not an optimal basis (e.g. heavy degeneracy), only the solver values are used
+        #-----------------------------------
+        #Step 4. Storing solution, shadow prices and reduced costs:
+        self.basis, self.B_inv, self.x_B = basis, B_inv, x_B
+        full = np.zeros(n + m)
+        full[basis] = x_B
+        self.x = full[:n]
+        self.y = y
+        self.reduced_costs = r[:n]
+        #-----------------------------------
+        #Step 5. RHS ranging: x_B + delta * B^-1 e_i >= 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = -x_B[:, None] / B_inv
+            lower = np.where(B_inv > TOLERANCE, ratio, -np.inf).max(axis=0)
+            upper = np.where(B_inv < -TOLERANCE, ratio, np.inf).min(axis=0)
+        self.rhs_lower = self.b + np.minimum(lower, 0.0)
+        self.rhs_upper = self.b + np.maximum(upper, 0.0)
+        #-----------------------------------
+        #Step 6. Objective ranging:
+        #Nonbasic product: its profit can rise by -reduced cost before it enters the basis.
+        self.profit_lower = np.full(n, -np.inf)
+        self.profit_upper = self.c - self.reduced_costs
+        #Basic product k: every nonbasic reduced cost r_l - delta * alpha_kl must stay <= 0.
+        alpha = B_inv @ M[:, nonbasic]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = r[nonbasic][None, :] / alpha
+            delta_lower = np.where(alpha > TOLERANCE, ratio, -np.inf).max(axis=1)
+            delta_upper = np.where(alpha < -TOLERANCE, ratio, np.inf).min(axis=1)
+        for k, column in enumerate(basis):
+            if column < n:
+                self.profit_lower[column] = self.c[column] + min(delta_lower[k], 0.0)
+                self.profit_upper[column] = self.c[column] + max(delta_upper[k], 0.0)
+        return True
+
+    @classmethod
+    def from_dataset(cls, mps_dataset):
+        """
+        Builds the LP relaxation from an MPS dataset (see load_mps_dataset).
+        """
+        profits, inventories, consumption = mps.split_mps_data(mps_dataset)
+        products = list(consumption.columns)
+        resources = list(inventories)
+        return cls(
+            [profits[product] for product in products],
+            [inventories[resource] for resource in resources],
+            consumption.loc[resources, products].to_numpy(dtype=float),
+            products, resources
+        )
+
+    def results(self, method="LP relaxation"):
+        """
+        Results in the solve_mps format, plus shadow prices and reduced costs.
+        """
+        return {
+            "status": self.status,
+            "total_profit": self.total_profit,
+            "production_plan": {mps.product_label(p): float(q) for p, q in zip(self.products, self.x)},
+            "shadow_prices": {r: float(y) for r, y in zip(self.resources, self.y)},
+            "reduced_costs": {mps.product_label(p): float(r) for p, r in zip(self.products, self.reduced_costs)},
+            "method": method
+        }
+
+    def resource_table(self):
+        """
+        One row per resource: inventory, use, slack, shadow price and the inventory range of the current basis.
+        """
+        use = self.A @ self.x
+        table = pd.DataFrame({
+            "Inventory": self.b,
+            "Used": use,
+            "Slack": self.b - use,
+            "Shadow Price": self.y
+        }, index=pd.Index(self.resources, name="Resource"))
+        if self.exact:
+            table["Inventory From"] = self.rhs_lower
+            table["Inventory To"] = self.rhs_upper
+        return table
+
+    def product_table(self):
+        """
+        One row per product: quantity, profit, reduced cost and the profit range of the current basis.
+        """
+        table = pd.DataFrame({
+            "Quantity": self.x,
+            "Profit": self.c,
+            "Reduced Cost": self.reduced_costs
+        }, index=pd.Index([mps.product_label(p) for p in self.products], name="Product"))
+        if self.exact:
+            table["Profit From"] = self.profit_lower
+            table["Profit To"] = self.profit_upper
+        return table
+
+    def what_if(self, resource=None, inventory=None, product=None, profit=None):
+        """
+        LP results after changing one inventory (resource + inventory) or one profit (product + profit).
+        Answered from the sensitivity data inside the valid range, re-solved outside of it.
+        Products are column names like Product_X.
+        """
+        if (resource is None) == (product is None):
+            raise ValueError("Give either a resource with its new inventory or a product with its new profit")
+        #-----------------------------------
+        #Inventory change: same basis, basic values move along B^-1 e_i, profit moves by the shadow price.
+        if resource is not None:
+            i = self.resources.index(resource)
+            if self.exact and self.rhs_lower[i] <= inventory <= self.rhs_upper[i]:
+                delta = inventory - self.b[i]
+                full = np.zeros(len(self.products) + len(self.resources))
+                full[self.basis] = self.x_B + delta * self.B_inv[:, i]
+                x = full[:len(self.products)]
+                return self._answer(x, self.total_profit + self.y[i] * delta)
+            b = self.b.copy()
+            b[i] = inventory
+            return MpsSensitivity(self.c, b, self.A, self.products, self.resources).results("re-solve")
+        #-----------------------------------
+        #Profit change: same solution, profit moves by the change times the quantity.
+        j = self.products.index(product)
+        if self.exact and self.profit_lower[j] <= profit <= self.profit_upper[j]:
+            return self._answer(self.x, self.total_profit + (profit - self.c[j]) * self.x[j])
+        c = self.c.copy()
+        c[j] = profit
+        return MpsSensitivity(c, self.b, self.A, self.products, self.resources).results("re-solve")
+
+    def _answer(self, x, total_profit):
+        return {
+            "status": self.status,
+            "total_profit": float(total_profit),
+            "production_plan": {mps.product_label(p): float(q) for p, q in zip(self.products, x)},
+            "method": "sensitivity"
+        }
+########################################################################################################################
+#LP-Relaxation Mode of solve_mps:
+def solve_mps_relaxation(profits, inventories, consumption):
+    """
+    Same input as solve_mps (split_mps_data output), solves the LP relaxation and
+    also returns shadow prices and reduced costs. The MpsSensitivity object is returned too,
+    for ranging tables and what-ifs.
+    """
+    products = list(consumption.columns)
+    resources = list(inventories)
+    sensitivity = MpsSensitivity(
+        [profits[product] for product in products],
+        [inventories[resource] for resource in resources],
+        consumption.loc[resources, products].to_numpy(dtype=float),
+        products, resources
+    )
+    return sensitivity.results(), sensitivity
+########################################################################################################################
@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+
+from Travelling_salesman_problem import local_search as ls
+
+DEFAULT_ITERATIONS = 1000       #used when neither a time limit nor an iteration limit is given
+
+
+def double_bridge(route, rng):      #random double-bridge kick: A B C D -> A C B D, returns the new route and the 8 touched cities
+	n = len(route)
+	i, j, k = sorted(rng.choice(np.arange(1, n), size=3, replace=False).tolist())
+	new_route = route[:i] + route[j:k] + route[i:j] + route[k:]
+	touched = {route[i - 1], route[i], route[j - 1], route[j], route[k - 1], route[k], route[0], route[-1]}
+	return new_route, list(touched)
+
+
+def ils_incumbents(route, dist, time_limit=None, max_iterations=None, seed=None, neighbors=None, k=10, stop_length=None):
+	#iterated local search: 2-opt, then double-bridge kick + 2-opt around the kick, yields every new best tour
+	#yields (route, length, iteration, seconds since start); stops at the time/iteration limit or at stop_length
+	started = time.perf_counter()
+	if time_limit is None and max_iterations is None:
+		max_iterations = DEFAULT_ITERATIONS
+	rng = np.random.default_rng(seed)
+	if neighbors is None:
+		neighbors = ls.neighbor_lists(dist, k)
+	prepared = ls.prepare(dist, neighbors)     #once for all iterations, dist is read directly so in-place edits are seen
+
+	current, current_length = ls.two_opt_neighbors(route, dist, prepared=prepared)
+	best, best_length = current, current_length
+	yield best, best_length, 0, time.perf_counter() - started
+
+	iteration = 0
+	while len(route) >= 8:                  #double bridge needs three cuts with cities in between
+		if max_iterations is not None and iteration >= max_iterations:
+			break
+		if time_limit is not None and time.perf_counter() - started >= time_limit:
+			break
+		if stop_length is not None and best_length <= stop_length:
+			break
+		iteration += 1
+
+		kicked, touched = double_bridge(current, rng)
+		candidate, candidate_length = ls.two_opt_neighbors(kicked, dist, active=touched, prepared=prepared)
+
+		if candidate_length <= current_length:      #accept equal tours too, helps to move across plateaus
+			current, current_length = candidate, candidate_length
+			if current_length < best_length - 1e-9:
+				best, best_length = current, current_length
+				yield best, best_length, iteration, time.perf_counter() - started
+
+
+def iterated_local_search(route, dist, time_limit=None, max_iterations=None, seed=None, neighbors=None, k=10,
+		stop_length=None, callback=None):       #best tour within the limits, callback(route, length, iteration, seconds) per incumbent
+	best, best_length = route, None
+	for best, best_length, iteration, seconds in ils_incumbents(route, dist, time_limit, max_iterations, seed,
+			neighbors, k, stop_length):
+		if callback is not None:
+			callback(best, best_length, iteration, seconds)
+	return best, best_length
@@ -0,0 +1,138 @@
+import csv
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+from Travelling_salesman_problem import tsp
+from Travelling_salesman_problem import local_search as ls
+
+RESULT_COLUMNS = ["instance", "cities", "length", "load_seconds", "solve_seconds", "route", "error"]
+
+
+def read_matrix(path):      #';' matrix csv like Dataset TSP.csv, without pandas
+	with open(path) as f:
+		n = len(f.readline().rstrip("\n").split(";")) - 1        #header: empty corner cell + one name per city
+		return np.loadtxt(f, delimiter=";", usecols=range(1, n + 1), ndmin=2)
+
+
+def iter_instances(source, exclude=()):     #(name, where to load it from) for a directory of .csv/.npy files or one .npz with many matrices
+	source = Path(source)
+	exclude = {Path(path).resolve() for path in exclude}       #e.g. the batch's own results csv
+	if source.is_dir():
+		for path in sorted(source.iterdir()):
+			if path.resolve() in exclude:
+				continue
+			if path.suffix in (".csv", ".npy") and not path.name.endswith(".dist.npy"):
+				yield path.name, (str(path), None)
+	elif source.suffix == ".npz":
+		with np.load(source) as archive:       #only the names are read here, the matrices are loaded by the workers
+			names = list(archive.files)
+		for name in names:
+			yield name, (str(source), name)
+	else:
+		raise ValueError(f"Batch source must be a directory or a .npz file: {source}")
+
+
+def load_instance(location, archives=None):     #archives: .npz files already opened by this worker
+	path, key = location
+	if key is not None:
+		if archives is None:
+			with np.load(path) as archive:
+				return archive[key]
+		if path not in archives:
+			archives[path] = np.load(path)
+		return archives[path][key]
+	if path.endswith(".npy"):
+		return np.load(path, mmap_mode="r")
+	return read_matrix(path)
+
+
+def solve_instance(name, location, k=10, archives=None):       #NN + neighbour-list 2-opt for one instance, with timings
+	started = time.perf_counter()
+	dist = load_instance(location, archives)
+	if dist.ndim != 2 or dist.shape[0] != dist.shape[1]:
+		raise ValueError(f"distance matrix must be square, got shape {dist.shape}")
+	loaded = time.perf_counter()
+	route = tsp.tsp_nearest_neighbor(dist, start=0)
+	if len(route) >= 4:
+		route, length = ls.two_opt_neighbors(route, dist, ls.neighbor_lists(dist, k))
+	else:
+		length = tsp.route_length(route, dist) if len(route) > 1 else 0
+	solved = time.perf_counter()
+	return {
+		"instance": name,
+		"cities": len(route),
+		"length": float(length),
+		"load_seconds": round(loaded - started, 6),
+		"solve_seconds": round(solved - loaded, 6),
+		"route": " ".join(map(str, route)),
+		"error": "" }
+
+
+def solve_chunk(chunk, k=10):       #one task = several small instances, so process start-up and messaging are shared
+	archives = {}
+	rows = []
+	try:
+		for name, location in chunk:
+			try:
+				rows.append(solve_instance(name, location, k, archives))
+			except Exception as error:      #a broken instance gets an error row, the rest of the batch goes on
+				rows.append({"instance": name, "error": f"{type(error).__name__}: {error}"})
+		return rows
+	finally:
+		for archive in archives.values():
+			archive.close()
+
+
+def _chunks(instances, chunk_size):
+	chunk = []
+	for instance in instances:
+		chunk.append(instance)
+		if len(chunk) == chunk_size:
+			yield chunk
+			chunk = []
+	if chunk:
+		yield chunk
+
+
+def solve_batch(source, output_csv, workers=None, max_pending=None, chunk_size=16, k=10):      #streams every instance through a worker pool
+	workers = workers or os.cpu_count() or 1
+	max_pending = max_pending or 2 * workers        #chunks in flight, bounds how many instances are in memory at the same time
+	started = time.perf_counter()
+	solved = failed = 0
+
+	with open(output_csv, "w", newline="") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+		writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+		writer.writeheader()
+		pending = set()
+
+		def write_finished(block):
+			nonlocal pending, solved, failed
+			done, pending = wait(pending, return_when=FIRST_COMPLETED if block else "ALL_COMPLETED")
+			for future in done:
+				rows = future.result()
+				writer.writerows(rows)
+				failed += sum(1 for row in rows if row["error"])
+				solved += len(rows)
+			f.flush()                       #results are on disk as soon as they are ready
+
+		for chunk in _chunks(iter_instances(source, exclude=[output_csv]), chunk_size):
+			if len(pending) >= max_pending:
+				write_finished(block=True)
+			pending.add(pool.submit(solve_chunk, chunk, k))
+		write_finished(block=False)
+
+	return {"instances": solved, "failed": failed, "seconds": time.perf_counter() - started}
+
+
+# FOR RUNNING FROM THE PROJECT ROOT: python -m Travelling_salesman_problem.batch <directory or .npz> <results.csv>
+if __name__ == "__main__":
+	if len(sys.argv) != 3:
+		print("Usage: python -m Travelling_salesman_problem.batch <directory or .npz> <results.csv>")
+		sys.exit(1)
+	summary = solve_batch(sys.argv[1], sys.argv[2])
+	print(f"Solved {summary['instances']} instances in {summary['seconds']:.2f} s ({summary['failed']} failed, see the error column)")
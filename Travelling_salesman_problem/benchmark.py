@@ -0,0 +1,71 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from Travelling_salesman_problem import tsp
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def two_opt_full_rebuild(route, dist):      #original 2-opt, rebuilds and re-measures the whole route for every pair
+	best = route
+	best_len = tsp.route_length(best, dist)
+	improved = True
+
+	while improved:
+		improved = False
+		for i in range(1, len(route) - 2):
+			for j in range(i + 1, len(route)):
+				if j - i == 1:
+					continue
+
+				new_route = best[:i] + best[i:j][::-1] + best[j:]
+				new_len = tsp.route_length(new_route, dist)
+
+				if new_len < best_len:
+					best = new_route
+					best_len = new_len
+					improved = True
+
+		route = best
+
+	return best, best_len
+
+
+def random_instance(n, seed=0):     #euclidean instance with n cities, used for sizes the csv does not have
+	rng = np.random.default_rng(seed)
+	points = rng.random((n, 2)) * 1000
+	return np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+
+
+def time_two_opt(two_opt, dist, repeats=1):     #returns (best time in seconds, tour length)
+	start_route = tsp.tsp_nearest_neighbor(dist, start=0)
+	best_time = float("inf")
+	for _ in range(repeats):
+		t0 = time.perf_counter()
+		_, length = two_opt(list(start_route), dist)
+		best_time = min(best_time, time.perf_counter() - t0)
+	return best_time, length
+
+
+def run_benchmark(sizes=(200, 500, 2000)):
+	df = pd.read_csv(BASE_DIR / "Dataset TSP.csv", sep=";")
+	dist = df.iloc[:, 1:].to_numpy()
+
+	print(f"{'Instance':<16} {'Implementation':<16} {'Time (s)':>10} {'Length':>12}")
+	print("-" * 58)
+	for name, func in (("full rebuild", two_opt_full_rebuild), ("delta", tsp.two_opt)):
+		seconds, length = time_two_opt(func, dist, repeats=5)
+		print(f"{'Dataset TSP':<16} {name:<16} {seconds:>10.4f} {length:>12.1f}")
+
+	for n in sizes:
+		dist = random_instance(n)
+		seconds, length = time_two_opt(tsp.two_opt, dist)
+		print(f"{'random ' + str(n):<16} {'delta':<16} {seconds:>10.4f} {length:>12.1f}")
+
+
+# FOR RUNNING THE BENCHMARK FROM THE PROJECT ROOT: python -m Travelling_salesman_problem.benchmark
+if __name__ == "__main__":
+	run_benchmark()
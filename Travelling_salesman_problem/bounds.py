@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+
+from Travelling_salesman_problem import tsp
+
+
+def one_tree(dist, pi):     #minimum 1-tree under node penalties pi, returns (penalised weight, degree of every city)
+	n = len(dist)
+	degree = np.zeros(n, dtype=int)
+
+	#prim over cities 1..n-1, rows are taken one at a time so coordinate input never builds a matrix
+	in_tree = np.zeros(n, dtype=bool)
+	in_tree[:2] = True                      #city 0 is the special node, the tree grows from city 1
+	key = np.asarray(dist[1], dtype=float) + pi[1] + pi
+	key[in_tree] = np.inf
+	parent = np.ones(n, dtype=int)
+	weight = 0.0
+	for _ in range(n - 2):
+		v = int(np.argmin(key))
+		weight += key[v]
+		degree[v] += 1
+		degree[parent[v]] += 1
+		in_tree[v] = True
+		key[v] = np.inf
+		row = np.asarray(dist[v], dtype=float) + pi[v] + pi
+		closer = (row < key) & ~in_tree
+		key[closer] = row[closer]
+		parent[closer] = v
+
+	#city 0 is joined to the tree by its two cheapest edges
+	row = np.asarray(dist[0], dtype=float) + pi[0] + pi
+	row[0] = np.inf
+	a, b = np.argpartition(row, 1)[:2]
+	weight += row[a] + row[b]
+	degree[[0, a, b]] += [2, 1, 1]
+	return weight - 2 * pi.sum(), degree
+
+
+def lower_bound(dist, upper_bound=None, iterations=100, integral=None):      #Held-Karp (1-tree + subgradient) bound for symmetric instances
+	n = len(dist)
+	if n <= 3:                              #only one tour exists
+		return float(tsp.route_length(list(range(n)), dist)) if n > 1 else 0.0
+	if upper_bound is None:
+		upper_bound = tsp.route_length(tsp.tsp_nearest_neighbor(dist), dist)
+	if integral is None:                    #integer distances -> every tour length is an integer too
+		integral = np.issubdtype(getattr(dist, "dtype", np.dtype(float)), np.integer)
+
+	pi = np.zeros(n)
+	best = -np.inf
+	step_scale = 2.0
+	since_improvement = 0
+	for _ in range(iterations):
+		bound, degree = one_tree(dist, pi)
+		if bound > best + 1e-9:
+			best = bound
+			since_improvement = 0
+		else:
+			since_improvement += 1
+			if since_improvement >= 5:      #no progress for a while: smaller steps
+				step_scale /= 2
+				since_improvement = 0
+
+		gradient = degree - 2
+		norm = float(gradient @ gradient)
+		if norm == 0:                       #the 1-tree is a tour, so the bound is the optimum
+			break
+		if best >= upper_bound - 1e-9 or step_scale < 1e-6:
+			break
+		pi += step_scale * (upper_bound - bound) / norm * gradient
+
+	if integral:
+		return float(math.ceil(best - 1e-6))
+	return float(best)
+
+
+def optimality_gap(length, bound):      #how far above the lower bound a tour is, as a fraction of the bound
+	if bound <= 0:
+		return 0.0 if length <= 0 else math.inf
+	return max(0.0, (length - bound) / bound)
+
+
+def stop_length(bound, gap):        #tours at most this long are provably within gap of the optimum (for stop_length=)
+	return bound * (1 + gap)
@@ -0,0 +1,144 @@
+import math
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class CoordinateDistances:      #distances computed on demand from coordinates, used in place of the n x n matrix
+	def __init__(self, points, metric="euclidean"):
+		if metric not in ("euclidean", "haversine"):
+			raise ValueError(f"Unknown metric: {metric} (use 'euclidean' or 'haversine')")
+		self.metric = metric
+		self.points = np.asarray(points, dtype=float)      #x/y, or lat/lon in degrees for haversine
+		if metric == "haversine":
+			self._coords = np.radians(self.points)
+		else:
+			self._coords = self.points
+		self._x = self._coords[:, 0].tolist()             #plain lists for the scalar distance() used in local search
+		self._y = self._coords[:, 1].tolist()
+		self._cos_lat = np.cos(self._coords[:, 0]).tolist()
+
+	def __len__(self):
+		return len(self.points)
+
+	def __getitem__(self, key):     #dist[i] -> row of distances, dist[a, b] -> distance(s) like a numpy matrix
+		if isinstance(key, tuple):
+			a, b = key
+			return self._vectorized(np.asarray(a), np.asarray(b))
+		return self._vectorized(np.asarray(key), np.arange(len(self)))
+
+	def _vectorized(self, a, b):
+		xa, ya = self._coords[a, 0], self._coords[a, 1]
+		xb, yb = self._coords[b, 0], self._coords[b, 1]
+		if self.metric == "euclidean":
+			return np.hypot(xa - xb, ya - yb)
+		h = np.sin((xb - xa) / 2) ** 2 + np.cos(xa) * np.cos(xb) * np.sin((yb - ya) / 2) ** 2
+		return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+	def distance(self, a, b):       #distance between two cities, pure python because it is called one pair at a time
+		if self.metric == "euclidean":
+			return math.hypot(self._x[a] - self._x[b], self._y[a] - self._y[b])
+		h = (math.sin((self._x[b] - self._x[a]) / 2) ** 2
+			+ self._cos_lat[a] * self._cos_lat[b] * math.sin((self._y[b] - self._y[a]) / 2) ** 2)
+		return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(h, 1.0)))
+
+	def _index_space(self):     #coordinates in which euclidean nearest neighbours are the true nearest neighbours
+		if self.metric == "euclidean":
+			return self.points
+		lat, lon = self._coords[:, 0], self._coords[:, 1]      #unit vectors: chord length grows with great-circle distance
+		return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+	def _grid(self):        #uniform grid over the index space: cell size, cell of every city and the cities of every cell
+		points = self._index_space()
+		n = len(points)
+		low = points.min(axis=0)
+		extent = points.max(axis=0) - low
+		extent = np.maximum(extent, max(extent.max(), 1.0) / n)       #flat or identical points still get a sensible grid
+		area = np.prod(np.sort(extent)[-2:])                    #cities lie on a surface, also the haversine unit sphere
+		cell = np.sqrt(area * 2 / n)                            #about two cities per cell
+		keys = list(map(tuple, np.floor((points - low) / cell).astype(np.int64).tolist()))
+		grid = {}
+		for i, key in enumerate(keys):
+			grid.setdefault(key, []).append(i)
+		return points, cell, keys, grid
+
+	def neighbor_lists(self, k=10):     #k nearest cities of every city through a uniform grid, no n x n matrix is built
+		points, cell, keys, grid = self._grid()
+		n, dim = points.shape
+		k = min(k, n - 1)
+
+		result = np.empty((n, k), dtype=np.int64)
+		for key, members in grid.items():
+			members = np.array(members)
+			radius = 1
+			while True:                 #grow the block until the k-th candidate is certainly inside it
+				ranges = [range(c - radius, c + radius + 1) for c in key]
+				candidates = [i for block in np.array(np.meshgrid(*ranges)).reshape(dim, -1).T.tolist()
+					for i in grid.get(tuple(block), ())]
+				if len(candidates) > k:
+					candidates = np.array(candidates)
+					d = np.sqrt(((points[members, None, :] - points[None, candidates, :]) ** 2).sum(axis=2))
+					d[members[:, None] == candidates[None, :]] = np.inf         #a city is never its own neighbour
+					nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+					kth = np.take_along_axis(d, nearest, axis=1).max()
+					if kth <= radius * cell or len(candidates) == n:    #every closer city lies inside the block
+						break
+				radius += 1
+			order = np.argsort(np.take_along_axis(d, nearest, axis=1), axis=1, kind="stable")
+			result[members] = candidates[np.take_along_axis(nearest, order, axis=1)]
+		return result
+
+	def nearest_neighbor_tour(self, start=0):       #same tour as tsp_nearest_neighbor, searching rings of grid cells
+		points, cell, keys, grid = self._grid()
+		n, dim = points.shape
+		visited = np.zeros(n, dtype=bool)
+		tour = [start]
+		current = start
+
+		while len(tour) < n:
+			visited[current] = True
+			grid[keys[current]].remove(current)
+			if not grid[keys[current]]:
+				del grid[keys[current]]         #only occupied cells are kept
+
+			found, radius = [], 0
+			while True:
+				if (2 * radius + 1) ** dim > len(grid):         #ring larger than what is left: check every unvisited city
+					found = np.flatnonzero(~visited).tolist()
+					break
+				for offset in product(range(-radius, radius + 1), repeat=dim):      #cells at exactly this ring
+					if max(map(abs, offset)) == radius:
+						found += grid.get(tuple(c + o for c, o in zip(keys[current], offset)), ())
+				if found:
+					d = self._vectorized(current, np.array(found))
+					closest = found[int(np.argmin(d))]
+					#every city at least as close as the best one found lies inside the searched block
+					if np.linalg.norm(points[closest] - points[current]) <= radius * cell:
+						break
+				radius += 1
+
+			found = np.array(found)
+			d = self._vectorized(current, found)
+			current = int(found[np.lexsort((found, d))[0]])     #closest city, ties go to the lowest index
+			tour.append(current)
+
+		return tour
+
+
+def load_coordinates(csv_file, sep=";"):        #reads name;x;y or name;lat;lon, returns city names and lazy distances
+	df = pd.read_csv(Path(csv_file), sep=sep)
+	columns = [col.strip().lower() for col in df.columns]
+	if "lat" in columns and "lon" in columns:
+		metric = "haversine"
+		points = df.iloc[:, [columns.index("lat"), columns.index("lon")]].to_numpy(dtype=float)
+	elif "x" in columns and "y" in columns:
+		metric = "euclidean"
+		points = df.iloc[:, [columns.index("x"), columns.index("y")]].to_numpy(dtype=float)
+	else:
+		raise ValueError(f"Coordinate CSV needs columns x;y or lat;lon, found: {df.columns.tolist()}")
+	city_names = df.iloc[:, 0].astype(str).tolist()
+	return city_names, CoordinateDistances(points, metric)
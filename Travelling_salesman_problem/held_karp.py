@@ -0,0 +1,63 @@
+import numpy as np
+
+from Travelling_salesman_problem import tsp
+from Travelling_salesman_problem import local_search as ls
+
+EXACT_LIMIT = 23                #largest instance solved exactly by default
+MAX_MEMORY = 2 ** 30            #bytes the dynamic programming tables may use (1 GiB)
+
+
+def held_karp_memory(n):        #bytes needed by held_karp for n cities: float64 costs + int8 parents
+	m = max(n - 1, 0)
+	return (2 ** m) * m * 9
+
+
+def held_karp(dist):        #exact TSP by bitmask dynamic programming, start/end city 0
+	d = np.asarray(dist, dtype=float)
+	n = len(d)
+	if n <= 2:              #only one tour exists
+		route = list(range(n))
+		return route, tsp.route_length(route, d) if n > 1 else 0.0
+	m = n - 1                               #bit j of a subset stands for city j + 1
+	inner = d[1:, 1:]                       #inner[i, j] = distance from city i+1 to city j+1
+
+	#cost[S, j]: shortest path that starts in city 0, visits exactly the cities in S and ends in city j+1
+	cost = np.full((2 ** m, m), np.inf)
+	parent = np.full((2 ** m, m), -1, dtype=np.int8)
+	single = 1 << np.arange(m)
+	cost[single, np.arange(m)] = d[0, 1:]
+
+	subsets = np.arange(2 ** m)
+	size = np.zeros(2 ** m, dtype=np.int8)
+	for bit in range(m):
+		size += (subsets >> bit) & 1
+
+	for k in range(2, m + 1):               #subsets of k cities only depend on subsets of k-1 cities
+		layer = subsets[size == k]
+		for j in range(m):
+			ending = layer[(layer >> j) & 1 == 1]                   #subsets that contain j, so the path can end there
+			before = cost[ending ^ (1 << j)] + inner[:, j]          #every possible previous city at once
+			best = np.argmin(before, axis=1)
+			cost[ending, j] = before[np.arange(len(ending)), best]
+			parent[ending, j] = best
+
+	full = 2 ** m - 1
+	j = int(np.argmin(cost[full] + d[1:, 0]))      #close the tour back to city 0
+	length = cost[full, j] + d[j + 1, 0]
+
+	route = []                              #walk the parents back from the full subset
+	subset = full
+	while j >= 0:
+		route.append(j + 1)
+		subset, j = subset ^ (1 << j), int(parent[subset, j])
+	return [0] + route[::-1], length
+
+
+def solve_tsp(dist, exact_limit=EXACT_LIMIT, max_memory=MAX_MEMORY):      #exact when small enough, heuristics otherwise
+	n = len(dist)
+	if n <= exact_limit and held_karp_memory(n) <= max_memory:
+		route, length = held_karp(dist)
+		return route, length, "held-karp"
+	route = tsp.tsp_nearest_neighbor(dist, start=0)
+	route, length = ls.vnd(route, dist)
+	return route, length, "heuristic"
@@ -0,0 +1,51 @@
+import numpy as np
+
+from Travelling_salesman_problem import tsp
+from Travelling_salesman_problem import local_search as ls
+
+#dist has to cover every city that is or may become part of the tour; the tour itself can be any subset of them
+
+
+def remove_cities(route, cities):       #drops cities from the tour, returns the new tour and the cities that got new neighbours
+	removed = set(cities)
+	n = len(route)
+	affected = set()
+	for i, city in enumerate(route):
+		if city in removed:                 #its neighbours in the tour are now joined by a new edge
+			affected.update((route[i - 1], route[(i + 1) % n]))
+	new_route = [city for city in route if city not in removed]
+	return new_route, [city for city in affected if city not in removed]
+
+
+def cheapest_insertion(route, dist, city):      #inserts one city where it makes the tour the least longer
+	tour = np.asarray(route)
+	following = np.roll(tour, -1)
+	extra = dist[tour, city] + dist[city, following] - dist[tour, following]
+	at = int(np.argmin(extra)) + 1
+	return route[:at] + [city] + route[at:]
+
+
+def insert_cities(route, dist, cities):     #cheapest insertion of every new city, one after the other
+	route = list(route)
+	for city in cities:
+		if len(route) < 2:
+			route.append(city)
+		else:
+			route = cheapest_insertion(route, dist, city)
+	return route
+
+
+def reoptimize(route, dist, add=(), remove=(), neighbors=None, k=10):      #updated tour after stops were added or removed
+	route, affected = remove_cities(route, remove)
+	route = insert_cities(route, dist, add)
+	if len(route) < 4:                      #nothing to improve
+		return route, tsp.route_length(route, dist) if len(route) > 1 else 0
+
+	if neighbors is None:
+		neighbors = ls.neighbor_lists(dist, k)
+	#local search only starts around the change: the touched cities and their candidate neighbours
+	active = set(affected) | set(add)
+	for city in list(active):
+		active.update(neighbors[city])
+	active = [city for city in route if city in active]
+	return ls.vnd(route, dist, neighbors, active=active)
@@ -0,0 +1,176 @@
+from collections import deque
+from functools import partial
+
+import numpy as np
+
+from Travelling_salesman_problem import tsp
+from Travelling_salesman_problem.coordinates import CoordinateDistances
+
+
+def neighbor_lists(dist, k=10, block=256):     #k nearest cities of every city, sorted by distance (candidate lists)
+	if isinstance(dist, CoordinateDistances):      #spatial grid instead of a full matrix
+		return dist.neighbor_lists(k)
+	n = len(dist)
+	k = min(k, n - 1)
+	result = np.empty((n, k), dtype=np.intp)
+	for start in range(0, n, block):        #a few rows at a time, the matrix (or memmap) is never copied as a whole
+		d = np.array(dist[start:start + block], dtype=float)       #copy of the block, the diagonal is overwritten below
+		rows = np.arange(len(d))
+		d[rows, start + rows] = np.inf      #a city is never its own neighbour
+		nearest = np.argpartition(d, k - 1, axis=1)[:, :k]         #k smallest per row, unordered
+		order = np.argsort(np.take_along_axis(d, nearest, axis=1), axis=1, kind="stable")
+		result[start:start + len(d)] = np.take_along_axis(nearest, order, axis=1)
+	return result
+
+
+def _distance_function(dist):       #d(a, b) for a single pair of cities
+	if isinstance(dist, CoordinateDistances):
+		return dist.distance
+	return np.asarray(dist).item            #reads one element of the array (or memmap) as a python float, nothing is copied
+
+
+def prepare(dist, neighbors):       #(d, neighbour rows as lists) for the move functions
+	#built once per search; repeated searches on the same instance (iterated local search, vnd) pass it on as prepared
+	return _distance_function(dist), np.asarray(neighbors).tolist()
+
+
+def _reverse(tour, pos, i, j):      #reverses the cyclic tour between positions i and j (inclusive)
+	n = len(tour)
+	length = (j - i) % n + 1
+	if 2 * length > n:              #reversing the complement gives the same cycle with less work
+		i, j = (j + 1) % n, (i - 1) % n
+		length = n - length
+	for _ in range(length // 2):
+		a, b = tour[i], tour[j]
+		tour[i], tour[j] = b, a
+		pos[a], pos[b] = j, i
+		i = (i + 1) % n
+		j = (j - 1) % n
+
+
+def _two_opt_move(a, tour, pos, d, neighbors):      #tries the 2-opt moves around city a, returns the changed cities
+	n = len(tour)
+	i = pos[a]
+	for step in (1, -1):                    #step 1: a and its successor, step -1: a and its predecessor
+		b = tour[(i + step) % n]
+		d_ab = d(a, b)
+		for c in neighbors[a]:
+			d_ac = d(a, c)
+			if d_ac >= d_ab:                #neighbours are sorted, no later c can give a gain either
+				break
+			if pos[c] < 0:                  #city is not part of this tour
+				continue
+			e = tour[(pos[c] + step) % n]
+			if c == b or e == a:
+				continue
+			delta = d_ac + d(b, e) - d_ab - d(c, e)
+			if delta < -1e-9:
+				if step == 1:               #... a b ... c e ...  ->  ... a c ... b e ...
+					_reverse(tour, pos, pos[b], pos[c])
+				else:                       #... e c ... b a ...  ->  ... e b ... c a ...
+					_reverse(tour, pos, pos[c], pos[b])
+				return (a, b, c, e)
+	return ()
+
+
+def _segment_move(a, tour, pos, d, neighbors, max_segment):      #moves a segment starting at city a, returns the changed cities
+	n = len(tour)
+	i = pos[a]
+	p = tour[i - 1]                         #predecessor of the segment
+	for length in range(1, min(max_segment, n - 3) + 1):
+		s1, s2 = a, tour[(i + length - 1) % n]      #first and last city of the segment
+		nx = tour[(i + length) % n]                 #successor of the segment
+		gain = d(p, s1) + d(s2, nx) - d(p, nx)      #saved by cutting the segment out and closing the gap
+		if gain <= 1e-9:
+			continue
+
+		best_delta, best_move = -1e-9, None
+		for end in (s1, s2):
+			for c in neighbors[end]:
+				if d(end, c) >= gain:       #new edge alone is longer than the gain, no later c helps either
+					break
+				if pos[c] < 0 or (pos[c] - i) % n < length:    #not in the tour or inside the segment
+					continue
+				for u, v in ((c, tour[(pos[c] + 1) % n]), (tour[pos[c] - 1], c)):
+					if (pos[u] - i) % n < length or (pos[v] - i) % n < length:
+						continue
+					forward = d(u, s1) + d(s2, v) - d(u, v) - gain         #u s1 ... s2 v
+					backward = d(u, s2) + d(s1, v) - d(u, v) - gain        #u s2 ... s1 v
+					if forward < best_delta:
+						best_delta, best_move = forward, (u, False)
+					if backward < best_delta:
+						best_delta, best_move = backward, (u, True)
+
+		if best_move is not None:
+			u, reverse = best_move
+			segment = [tour[(i + k) % n] for k in range(length)]
+			rest = [tour[(i + length + k) % n] for k in range(n - length)]     #tour without the segment, starting at nx
+			at = (pos[u] - i - length) % n + 1          #insert right after u
+			tour[:] = rest[:at] + (segment[::-1] if reverse else segment) + rest[at:]
+			for k, city in enumerate(tour):
+				pos[city] = k
+			return (p, nx, s1, s2, u, rest[at % len(rest)])
+	return ()
+
+
+def _local_search(route, dist, neighbors, k, active, move, prepared):       #don't-look-bit driver shared by all move types
+	if prepared is None:
+		if neighbors is None:
+			neighbors = neighbor_lists(dist, k)
+		prepared = prepare(dist, neighbors)
+	d, neighbors = prepared
+	tour = list(route)
+	pos = [-1] * len(dist)
+	for i, city in enumerate(tour):
+		pos[city] = i
+
+	#don't-look bits: only cities in the queue are looked at, every other city has its bit set
+	queue = deque(tour if active is None else active)
+	queued = [False] * len(dist)
+	for city in queue:
+		queued[city] = True
+
+	while queue:
+		a = queue.popleft()
+		queued[a] = False
+		changed = move(a, tour, pos, d, neighbors)
+		for city in changed:                #endpoints of an applied move are looked at again
+			if not queued[city]:
+				queued[city] = True
+				queue.append(city)
+
+	start = pos[route[0]]                   #same start city as the input route
+	tour = tour[start:] + tour[:start]
+	return tour, tsp.route_length(tour, dist)
+
+
+def two_opt_neighbors(route, dist, neighbors=None, k=10, active=None, prepared=None):     #2-opt with candidate lists and don't-look bits
+	return _local_search(route, dist, neighbors, k, active, _two_opt_move, prepared)
+
+
+def or_opt(route, dist, neighbors=None, k=10, active=None, max_segment=3, prepared=None):     #moves segments of 1-3 cities, also reversed
+	return _local_search(route, dist, neighbors, k, active, partial(_segment_move, max_segment=max_segment), prepared)
+
+
+def three_opt(route, dist, neighbors=None, k=10, active=None, max_segment=30, prepared=None):     #segment insertion 3-opt (or-3opt): longer segments
+	return _local_search(route, dist, neighbors, k, active, partial(_segment_move, max_segment=max_segment), prepared)
+
+
+def vnd(route, dist, neighbors=None, k=10, active=None, prepared=None):       #variable neighbourhood descent over all move types
+	if prepared is None:
+		if neighbors is None:
+			neighbors = neighbor_lists(dist, k)
+		prepared = prepare(dist, neighbors)
+	moves = (two_opt_neighbors, or_opt, three_opt)      #cheapest move first
+	length = tsp.route_length(route, dist)
+	level = 0
+
+	while level < len(moves):               #stops when no move type improves the tour any more
+		new_route, new_length = moves[level](route, dist, active=active, prepared=prepared)     #active=None: every city
+		if new_length < length - 1e-9:
+			route, length = new_route, new_length
+			level = 0                       #back to the cheapest move type
+		else:
+			level += 1
+
+	return route, length
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def _file_hash(path):       #sha256 of the source csv, read in blocks
+	digest = hashlib.sha256()
+	with open(path, "rb") as f:
+		for block in iter(lambda: f.read(1 << 20), b""):
+			digest.update(block)
+	return digest.hexdigest()
+
+
+def _compact_dtype(values):     #smallest dtype that holds the matrix and a sum of four of its entries (2-opt deltas)
+	if np.all(np.isfinite(values)) and np.all(values == np.round(values)):
+		bound = 4 * max(abs(values.min()), abs(values.max()))
+		for dtype in (np.int16, np.int32, np.int64):
+			if bound <= np.iinfo(dtype).max:
+				return dtype
+	if np.array_equal(values.astype(np.float32), values, equal_nan=True):
+		return np.float32
+	return np.float64
+
+
+def cache_paths(csv_path):      #binary matrix and metadata are stored next to the csv
+	csv_path = Path(csv_path)
+	return csv_path.with_suffix(".dist.npy"), csv_path.with_suffix(".dist.json")
+
+
+def build_cache(csv_path):      #parses the csv once and writes the compact .npy + metadata
+	csv_path = Path(csv_path)
+	npy_path, meta_path = cache_paths(csv_path)
+	stat = csv_path.stat()
+
+	df = pd.read_csv(csv_path, sep=";")
+	values = df.iloc[:, 1:].to_numpy(dtype=float)
+	dist = values.astype(_compact_dtype(values))
+
+	tmp_path = npy_path.with_name(npy_path.name + ".tmp")
+	with open(tmp_path, "wb") as f:         #written under a temporary name so readers never see half a file
+		np.save(f, dist)
+	os.replace(tmp_path, npy_path)
+
+	meta = {
+		"source_mtime_ns": stat.st_mtime_ns,
+		"source_size": stat.st_size,
+		"source_sha256": _file_hash(csv_path),
+		"dtype": dist.dtype.name,
+		"city_names": df.columns.tolist()[1:] }
+	meta_path.write_text(json.dumps(meta))
+	return meta
+
+
+def load_distance_matrix(csv_path):     #returns (city names, memory-mapped matrix), rebuilding the cache when the csv changed
+	csv_path = Path(csv_path)
+	if not csv_path.exists():
+		raise FileNotFoundError(f"CSV file not found: {csv_path}")
+	npy_path, meta_path = cache_paths(csv_path)
+	stat = csv_path.stat()
+
+	meta = None
+	if npy_path.exists() and meta_path.exists():
+		try:
+			meta = json.loads(meta_path.read_text())
+		except ValueError:                  #damaged metadata, rebuild below
+			meta = None
+
+	if meta is None or meta.get("source_size") != stat.st_size:
+		meta = build_cache(csv_path)
+	elif meta.get("source_mtime_ns") != stat.st_mtime_ns:
+		#touched but maybe not changed: only the hash decides whether the matrix has to be parsed again
+		if _file_hash(csv_path) == meta.get("source_sha256"):
+			meta["source_mtime_ns"] = stat.st_mtime_ns
+			meta_path.write_text(json.dumps(meta))
+		else:
+			meta = build_cache(csv_path)
+
+	#read-only memory map: opens in milliseconds and is shared between processes through the page cache
+	return meta["city_names"], np.load(npy_path, mmap_mode="r")
@@ -0,0 +1,63 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Travelling_salesman_problem import tsp
+from Travelling_salesman_problem import local_search as ls
+
+#set once per worker process by _init_worker
+_shm = None
+_dist = None
+_prepared = None
+
+
+def _init_worker(shm_name, shape, dtype, neighbors):       #attaches the worker to the shared distance matrix
+	global _shm, _dist, _prepared
+	_shm = shared_memory.SharedMemory(name=shm_name)
+	_dist = np.ndarray(shape, dtype=dtype, buffer=_shm.buf)        #view, nothing is copied
+	_prepared = ls.prepare(_dist, neighbors)        #distances are read from the shared buffer, only the neighbour rows are per worker
+
+
+def _descent(start):        #one NN construction + local search from the given start city
+	route = tsp.tsp_nearest_neighbor(_dist, start=start)
+	route, length = ls.two_opt_neighbors(route, _dist, prepared=_prepared)
+	return float(length), route, start
+
+
+def multi_start_tsp(dist, starts=None, workers=None, k=10, seed=None, stop_length=None):     #best tour of many NN + 2-opt descents
+	dist = np.ascontiguousarray(dist)
+	n = len(dist)
+	workers = workers or os.cpu_count() or 1
+
+	if starts is None:                      #default: a few descents per worker
+		starts = min(n, 4 * workers)
+	if isinstance(starts, int):             #number of randomly chosen, distinct start cities
+		rng = np.random.default_rng(seed)
+		starts = rng.choice(n, size=min(starts, n), replace=False).tolist()
+
+	neighbors = ls.neighbor_lists(dist, k)  #built once, sent to every worker only once
+
+	#the matrix is copied into shared memory once instead of being pickled for every task
+	shm = shared_memory.SharedMemory(create=True, size=dist.nbytes)
+	try:
+		np.ndarray(dist.shape, dtype=dist.dtype, buffer=shm.buf)[:] = dist
+		with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+				initargs=(shm.name, dist.shape, dist.dtype, neighbors)) as pool:
+			futures = [pool.submit(_descent, start) for start in starts]
+			best_length, best_route, best_start = float("inf"), None, n
+			for future in as_completed(futures):
+				length, route, start = future.result()
+				if (length, start) < (best_length, best_start):     #ties go to the lower start city, whatever finishes first
+					best_length, best_route, best_start = length, route, start
+				if stop_length is not None and best_length <= stop_length:     #good enough, skip the descents not started yet
+					for pending in futures:
+						pending.cancel()
+					break
+	finally:
+		shm.close()
+		shm.unlink()
+
+	first = best_route.index(0)             #every route is shown starting at city 0
+	return best_route[first:] + best_route[:first], best_length, best_start
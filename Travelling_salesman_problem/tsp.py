@@ -1,27 +1,36 @@
-import pandas as pd
+import numpy as np
+
+from Travelling_salesman_problem import anytime as an
+from Travelling_salesman_problem import bounds as bd
+from Travelling_salesman_problem import local_search as ls
+from Travelling_salesman_problem.coordinates import CoordinateDistances
+from Travelling_salesman_problem import matrix_cache as mc
+from Travelling_salesman_problem import multi_start as ms
 
 
 def tsp_nearest_neighbor(dist, start=0):                #Nearest Neighbour Heuristic
+	if isinstance(dist, CoordinateDistances):       #coordinate input: grid search, no distance rows
+		return dist.nearest_neighbor_tour(start)
+
 	n = len(dist)               #n is the amount of rows in the df
 	visited = [start]           #saves the order of the cities visited
+	is_visited = np.zeros(n, dtype=bool)       #visited mask, True for every city already in the route
+	is_visited[start] = True
 	current = start             #city we are in right now
 
 	while len(visited) < n:     #as long as not every city has been visited
-		next_city = min(
-			(i for i in range(n) if i not in visited),  #checks not yet visited cities, chooses minimal distance
-			key=lambda i: dist[current, i])        #lambda = ad hoc function; chooses city index of minimal distance
+		row = np.where(is_visited, np.inf, dist[current])      #visited cities can never be the minimum
+		next_city = int(np.argmin(row))     #argmin returns the first minimum -> same tie-breaking as the lowest index
 		visited.append(next_city)       #chosen city
+		is_visited[next_city] = True
 		current = next_city             #new start city
 
 	return visited
 
 
 def route_length(route, dist):    #computes route length
-	total = 0
-	for i in range(len(route) - 1):                 #creates range using the list from nn
-		total += dist[route[i], route[i + 1]]       #searches distance from one city to the next in df, adds to total
-	total += dist[route[-1], route[0]]              #return to start city
-	return total
+	route = np.asarray(route)
+	return dist[route, np.roll(route, -1)].sum()    #distance from every city to the next one, last entry returns to start city
 
 
 def route_to_names(route, city_names):      #Help function, displays route in readable format.
@@ -29,42 +38,31 @@ def route_to_names(route, city_names):      #Help function, displays route in re
 
 
 def two_opt(route, dist):       #2-opt
-	best = route
-	best_len = route_length(best, dist)
+	tour = np.array(route)      #array-backed tour, segments are reversed in place
+	n = len(tour)
 	improved = True         #True in order for the while loop to start
 
 	while improved:         #the algorithm runs until no improvements can be found (local optimum)
 		improved = False
-		for i in range(1, len(route) - 2):      #-2 because start and end have to stay the same
-			for j in range(i + 1, len(route)):
-				if j - i == 1:                  #if j is the index of the city visited after i -> no 2 opt possible
-					continue                    #j+=1 or if last j then next i
-
-				new_route = best[:i] + best[i:j][::-1] + best[j:]   #flips everything between i and j
-				new_len = route_length(new_route, dist)
-
-				if new_len < best_len:          #variables are only updated if the new route is better
-					best = new_route
-					best_len = new_len
-					improved = True
-
-		route = best
+		for i in range(1, n - 2):       #start city has to stay the same
+			a, b = tour[i - 1], tour[i]                 #edge (a, b) is removed
+			c = tour[i + 1:]                            #c = tour[j-1] for every j in i+2..n
+			e = np.append(tour[i + 2:], tour[0])        #e = tour[j], last j closes the tour
+			#only the four changed edges are scored: (a,b) + (c,e) are replaced by (a,c) + (b,e)
+			delta = dist[a, c] + dist[b, e] - dist[a, b] - dist[c, e]
+			k = np.argmin(delta)
 
-	return best, best_len
+			if delta[k] < -1e-9:        #the tour is only changed if the move is an improvement (tolerance against rounding loops)
+				j = i + 2 + k
+				tour[i:j] = tour[i:j][::-1].copy()      #flips everything between i and j
+				improved = True
 
+	return tour.tolist(), route_length(tour, dist)
 
-def run_tsp ():
-	df = pd.read_csv("Travelling_salesman_problem/Dataset TSP.csv", sep=";")
-	#sep because pandas normally with commas; folder hard coded
 
-	city_names = df.columns.tolist()[1:]  # first column
-	# print(df.columns.tolist()[1:])
-
-	dist = df.iloc[:, 1:].to_numpy()  # only numerical values, saved as NumPy-Array
-	# print(df)
-	# print(dist.shape)   # (29, 29)
-	# print(city_names[:5])
-	# print(df.columns.tolist())
+def run_tsp (multi_start=False):       #multi_start: also run NN + 2-opt from every city on a process pool
+	#compact binary copy of the csv, only parsed again when the csv changes; folder hard coded
+	city_names, dist = mc.load_distance_matrix("Travelling_salesman_problem/Dataset TSP.csv")
 
 	nn_route = tsp_nearest_neighbor(dist, start=0)  # nn route using indices
 	# print("NN Route (Index):", nn_route)
@@ -73,11 +71,29 @@ def run_tsp ():
  
 	print("\n\033[35mCalculating TSP solution using preset data...\033[0m")
 	print("\nRoute length according to Nearest Neighbour:", nn_length)
+	lower_bound = bd.lower_bound(dist, upper_bound=nn_length)      #no tour can be shorter than this
+	print(f"Lower bound (Held-Karp 1-tree): {lower_bound}  -> NN gap {bd.optimality_gap(nn_length, lower_bound):.2%}")
 
 	print(route_to_names(nn_route, city_names))
 
-	opt_route, opt_length = two_opt(nn_route, dist)
+	neighbors = ls.neighbor_lists(dist, k=10)       #candidate lists, built once per instance
+	opt_route, opt_length = ls.two_opt_neighbors(nn_route, dist, neighbors)
 
-	print("2-opt length:", opt_length)
+	print(f"2-opt length: {opt_length}  (gap {bd.optimality_gap(opt_length, lower_bound):.2%})")
 	print(route_to_names(opt_route, city_names))    #although city 1 not mentioned in list end, distance has been added
+
+	vnd_route, vnd_length = ls.vnd(opt_route, dist, neighbors)     #2-opt, Or-opt and 3-opt until none improves
+	print(f"VND length (2-opt + Or-opt + 3-opt): {vnd_length}  (gap {bd.optimality_gap(vnd_length, lower_bound):.2%})")
+	print(route_to_names(vnd_route, city_names))
+
+	#stops early once the tour reaches the lower bound, it is optimal then
+	ils_route, ils_length = an.iterated_local_search(vnd_route, dist, time_limit=2, seed=0, neighbors=neighbors,
+		stop_length=bd.stop_length(lower_bound, 0.0))
+	print(f"Iterated local search length (max. 2 seconds): {ils_length}  (gap {bd.optimality_gap(ils_length, lower_bound):.2%})")
+	print(route_to_names(ils_route, city_names))
+
+	if multi_start:
+		ms_route, ms_length, ms_start = ms.multi_start_tsp(dist, starts=len(dist), stop_length=bd.stop_length(lower_bound, 0.0))
+		print(f"Multi-start length (best start {city_names[ms_start]}): {ms_length}  (gap {bd.optimality_gap(ms_length, lower_bound):.2%})")
+		print(route_to_names(ms_route, city_names))
 	input("\nPress Enter to continue...")
\ No newline at end of file